@@ -1,82 +1,316 @@
+import time
+import threading
 import numpy as np
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Dict, FrozenSet
 from config import AppConfig
+from interfaces import BaseInferenceBackend
 from face_detector import FaceDetector
-from landmark_extractor import LandmarkExtractor
-from drowsiness_analyzer import DrowsinessAnalyzer
-from attention_analyzer import AttentionAnalyzer
+from face_tracker import LandmarkFaceTracker
+from landmark_extractor import LandmarkExtractor, FaceLandmarks
+from drowsiness_analyzer import DrowsinessAnalyzer, DrowsinessResult
+from attention_analyzer import AttentionAnalyzer, AttentionResult
 from emotion_classifier import EmotionClassifier
+from emotion_gate import EmotionGate
 from state_aggregator import StateAggregator, CombinedState
+from stage_scheduler import StageScheduler
+from metrics import PipelineMetrics
+from model_loader import ModelLoader
+
+
+@dataclass
+class FrameTask:
+    frame: np.ndarray
+    sequence: int = 0
+    stages: FrozenSet[str] = frozenset(StageScheduler.STAGES)
+    tracked: bool = False
+    reused_bbox: bool = False
+    reset: bool = False
+    calibration_reset: bool = False
+    warming_up: bool = False
+    started_at: float = 0.0
+    emotion_inferred: bool = False
+    gate_hit: Optional[bool] = None
+    bbox: Optional[Tuple[int, int, int, int]] = None
+    landmarks: Optional[FaceLandmarks] = None
+    drowsiness: Optional[DrowsinessResult] = None
+    attention: Optional[AttentionResult] = None
+    calibrating: bool = False
+    cognitive_state: str = "desconocido"
+    emotion: str = "Unknown"
+    confidence: float = 0.0
+    emotion_scores: Dict[str, float] = field(default_factory=dict)
+    raw_scores: Optional[np.ndarray] = None
+    state: Optional[CombinedState] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[Exception] = None
 
 
 class AnalysisPipeline:
-    def __init__(self, config: AppConfig = None):
+    def __init__(self, config: AppConfig = None, emotion_backend: BaseInferenceBackend = None):
         self._config = config or AppConfig()
-        self._face_detector = FaceDetector(self._config.detector)
-        self._landmark_extractor = LandmarkExtractor()
+        self._face_detector: Optional[FaceDetector] = None
+        self._landmark_extractor: Optional[LandmarkExtractor] = None
+        self._emotion_classifier: Optional[EmotionClassifier] = None
+        self._loader = ModelLoader()
+        self._loader.add("detector", lambda: FaceDetector(self._config.detector), FaceDetector.warm_up)
+        self._loader.add("landmarks", LandmarkExtractor, LandmarkExtractor.warm_up)
+        self._loader.add(
+            "emotion",
+            lambda: EmotionClassifier(self._config.emotion, emotion_backend),
+            None if emotion_backend else EmotionClassifier.warm_up
+        )
+        self._loader.start()
+        self._ready = False
+        self._face_tracker = LandmarkFaceTracker(self._config.detector) if self._config.detector.tracking else None
         self._drowsiness_analyzer = DrowsinessAnalyzer(self._config.drowsiness)
         self._attention_analyzer = AttentionAnalyzer(self._config.attention)
-        self._emotion_classifier = EmotionClassifier(self._config.emotion)
+        self._emotion_gate = EmotionGate(self._config.emotion) if self._config.emotion.gating != "off" else None
         self._state_aggregator = StateAggregator()
+        self._scheduler = StageScheduler(self._config.scheduler) if self._config.scheduler.enabled else None
+        self._metrics = PipelineMetrics(self._config.metrics) if self._config.metrics.enabled else None
+        self._lock = threading.Lock()
+        self._reset_requested = False
+        self._calibration_reset_requested = False
         self._last_state = None
         self._last_bbox = None
+        self._last_landmarks = None
+        self._last_drowsiness = None
+        self._last_attention = None
+        self._last_emotion = None
+        self._recorder = None
+        if not self._config.background_init:
+            self.wait_until_ready()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        if self._ready:
+            return True
+        if not self._loader.wait(timeout):
+            if self._loader.error is not None:
+                raise self._loader.error
+            return False
+        self._face_detector = self._loader.get("detector")
+        self._landmark_extractor = self._loader.get("landmarks")
+        self._emotion_classifier = self._loader.get("emotion")
+        self._ready = True
+        return True
+
+    def attach_recorder(self, recorder):
+        self._recorder = recorder
+
+    def new_task(self, frame: np.ndarray, sequence: int = 0) -> FrameTask:
+        task = FrameTask(frame=frame, sequence=sequence, started_at=time.perf_counter())
+        if not self.wait_until_ready(0):
+            task.warming_up = True
+            task.stages = frozenset()
+        else:
+            if self._scheduler:
+                task.stages = self._scheduler.next_stages()
+            with self._lock:
+                task.reset = self._reset_requested
+                task.calibration_reset = self._calibration_reset_requested
+                self._reset_requested = False
+                self._calibration_reset_requested = False
+        return task
 
     def process(self, frame: np.ndarray) -> Tuple[CombinedState, Optional[Tuple[int, int, int, int]]]:
-        bbox = self._face_detector.detect(frame)
-        
-        if bbox is None:
-            state = self._state_aggregator.aggregate(face_detected=False)
-            self._last_state = state
-            self._last_bbox = None
-            return state, None
-        
-        self._last_bbox = bbox
-        
-        landmarks = self._landmark_extractor.extract(frame)
-        
-        if landmarks is None:
-            cognitive_state = "desconocido"
-            emotion = "Unknown"
-            confidence = 0.0
-            emotion_scores = {}
-            drowsiness = None
-            attention = None
-            calibrating = False
+        task = self.new_task(frame)
+        self.run_detection(task)
+        self.run_landmarks(task)
+        self.run_emotion(task)
+        self.finalize(task)
+        return task.state, task.bbox
+
+    def run_detection(self, task: FrameTask):
+        if task.warming_up:
+            return
+        if task.reset:
+            self._face_detector.reset()
+            if self._face_tracker:
+                self._face_tracker.reset()
+        if self._face_tracker and self._face_tracker.is_tracking:
+            task.tracked = True
+            return
+        with self._lock:
+            last_bbox = self._last_bbox
+        if "detection" not in task.stages and last_bbox is not None:
+            task.bbox = last_bbox
+            task.reused_bbox = True
+            return
+
+        started = time.perf_counter()
+        task.bbox = self._face_detector.detect(task.frame)
+        task.timings["detection"] = time.perf_counter() - started
+
+    def run_landmarks(self, task: FrameTask):
+        if task.warming_up:
+            return
+        if task.reset:
+            self._drowsiness_analyzer.reset()
+            self._attention_analyzer.reset()
+            self._last_landmarks = None
+            self._last_drowsiness = None
+            self._last_attention = None
+        if task.calibration_reset:
+            self._attention_analyzer.reset_calibration()
+        if "landmarks" not in task.stages and not task.tracked:
+            if task.bbox is not None:
+                task.landmarks = self._last_landmarks
         else:
-            drowsiness = self._drowsiness_analyzer.analyze(landmarks)
-            attention = self._attention_analyzer.analyze(landmarks)
-            calibrating = not self._attention_analyzer.is_calibrated
-            
-            face_crop = self._face_detector.crop_face(frame, bbox)
-            cognitive_state, confidence, emotion, emotion_scores = self._emotion_classifier.predict(face_crop)
-        
-        state = self._state_aggregator.aggregate(
-            face_detected=True,
-            cognitive_state=cognitive_state,
-            emotion=emotion,
-            confidence=confidence,
-            emotion_scores=emotion_scores,
-            drowsiness=drowsiness,
-            attention=attention,
-            calibrating=calibrating
-        )
-        
-        self._last_state = state
-        return state, bbox
+            started = time.perf_counter()
+            if task.tracked:
+                task.landmarks = self._landmark_extractor.extract(task.frame)
+                task.bbox = self._face_tracker.update(task.landmarks, task.frame.shape)
+            elif task.bbox is not None:
+                task.landmarks = self._landmark_extractor.extract(task.frame)
+                if self._face_tracker:
+                    task.bbox = self._face_tracker.update(task.landmarks, task.frame.shape) or task.bbox
+                if task.landmarks is None and task.reused_bbox:
+                    task.bbox = None
+                    with self._lock:
+                        self._last_bbox = None
+            task.timings["landmarks"] = time.perf_counter() - started
+
+        if task.bbox is None:
+            task.landmarks = None
+            return
+
+        self._last_landmarks = task.landmarks
+        if task.landmarks is None:
+            return
+
+        if "drowsiness" in task.stages or self._last_drowsiness is None:
+            started = time.perf_counter()
+            self._last_drowsiness = self._drowsiness_analyzer.analyze(task.landmarks)
+            task.timings["drowsiness"] = time.perf_counter() - started
+        task.drowsiness = self._last_drowsiness
+
+        if "attention" in task.stages or self._last_attention is None:
+            started = time.perf_counter()
+            self._last_attention = self._attention_analyzer.analyze(task.landmarks)
+            task.timings["attention"] = time.perf_counter() - started
+        task.attention = self._last_attention
+        task.calibrating = not self._attention_analyzer.is_calibrated
+
+    def run_emotion(self, task: FrameTask):
+        if task.warming_up:
+            return
+        if task.reset:
+            self._emotion_classifier.reset()
+            if self._emotion_gate:
+                self._emotion_gate.reset()
+            self._last_emotion = None
+        if task.bbox is None or task.landmarks is None:
+            return
+
+        if "emotion" not in task.stages and self._last_emotion is not None:
+            task.cognitive_state, task.confidence, task.emotion, task.emotion_scores = self._last_emotion
+            return
+
+        started = time.perf_counter()
+        face_crop = self._face_detector.crop_face(task.frame, task.bbox)
+        scores = None
+        if self._emotion_gate:
+            scores = self._emotion_gate.lookup(task.landmarks, face_crop)
+            task.gate_hit = scores is not None
+        if scores is None:
+            scores = self._emotion_classifier.infer_scores(face_crop)
+            task.emotion_inferred = True
+            if self._emotion_gate:
+                self._emotion_gate.store(scores)
+        task.raw_scores = scores
+        self._last_emotion = self._emotion_classifier.classify_scores(scores)
+        task.cognitive_state, task.confidence, task.emotion, task.emotion_scores = self._last_emotion
+        task.timings["emotion"] = time.perf_counter() - started
+
+    def finalize(self, task: FrameTask) -> CombinedState:
+        if task.warming_up:
+            task.state = self._state_aggregator.aggregate(face_detected=False, warming_up=True)
+            self._last_state = task.state
+            return task.state
+
+        if task.bbox is None:
+            task.state = self._state_aggregator.aggregate(face_detected=False)
+        else:
+            task.state = self._state_aggregator.aggregate(
+                face_detected=True,
+                cognitive_state=task.cognitive_state,
+                emotion=task.emotion,
+                confidence=task.confidence,
+                emotion_scores=task.emotion_scores,
+                drowsiness=task.drowsiness,
+                attention=task.attention,
+                calibrating=task.calibrating
+            )
+
+        self._last_state = task.state
+        with self._lock:
+            self._last_bbox = task.bbox
+        if self._recorder is not None:
+            if task.reset:
+                self._recorder.mark_reset()
+            if task.calibration_reset:
+                self._recorder.mark_calibration_reset()
+            self._recorder.record(task)
+        if self._scheduler:
+            if task.reset:
+                self._scheduler.reset()
+            self._scheduler.record(task.timings)
+        if self._metrics:
+            task.timings["total"] = time.perf_counter() - task.started_at
+            self._metrics.observe(task.timings, task.bbox is not None, task.emotion_inferred, task.gate_hit)
+        return task.state
+
+    def mark_skipped(self):
+        if self._metrics:
+            self._metrics.record_skipped()
 
     def update_image_size(self, width: int, height: int):
         self._attention_analyzer.update_image_size(width, height)
 
     def reset(self):
-        self._drowsiness_analyzer.reset()
-        self._attention_analyzer.reset()
-        self._emotion_classifier.reset()
+        with self._lock:
+            self._reset_requested = True
 
     def reset_calibration(self):
-        self._attention_analyzer.reset_calibration()
+        with self._lock:
+            self._calibration_reset_requested = True
 
     def release(self):
-        self._landmark_extractor.release()
+        if self._metrics:
+            self._metrics.stop()
+        self._loader.join()
+        landmark_extractor = self._loader.get("landmarks")
+        if landmark_extractor is not None:
+            landmark_extractor.release()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    @property
+    def loader(self) -> ModelLoader:
+        return self._loader
+
+    @property
+    def face_tracker(self) -> Optional[LandmarkFaceTracker]:
+        return self._face_tracker
+
+    @property
+    def emotion_gate(self) -> Optional[EmotionGate]:
+        return self._emotion_gate
+
+    @property
+    def recorder(self):
+        return self._recorder
+
+    @property
+    def scheduler(self) -> Optional[StageScheduler]:
+        return self._scheduler
+
+    @property
+    def metrics(self) -> Optional[PipelineMetrics]:
+        return self._metrics
 
     @property
     def last_state(self) -> Optional[CombinedState]:
@@ -84,4 +318,5 @@ class AnalysisPipeline:
 
     @property
     def last_bbox(self) -> Optional[Tuple[int, int, int, int]]:
-        return self._last_bbox
\ No newline at end of file
+        with self._lock:
+            return self._last_bbox
\ No newline at end of file
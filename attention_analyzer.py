@@ -1,10 +1,10 @@
 import numpy as np
 from typing import Tuple, Optional
 from dataclasses import dataclass
-from collections import deque
 from interfaces import BaseAnalyzer
 from config import AttentionConfig
 from landmark_extractor import FaceLandmarks
+from streaming_filters import RunningMedian, RunningStats
 
 
 @dataclass
@@ -23,9 +23,13 @@ class AttentionAnalyzer(BaseAnalyzer):
         self._image_size = image_size
         self._baseline_pitch: Optional[float] = None
         self._baseline_yaw: Optional[float] = None
-        self._calibration_frames = deque(maxlen=30)
+        self._calibration_pitch = RunningMedian(30)
+        self._calibration_yaw = RunningMedian(30)
+        self._calibration_pitch_stats = RunningStats(30)
+        self._calibration_yaw_stats = RunningStats(30)
         self._is_calibrated = False
-        self._pose_history = deque(maxlen=5)
+        self._pitch_filter = RunningMedian(5)
+        self._yaw_filter = RunningMedian(5)
         
     def _calculate_face_direction(self, landmarks: FaceLandmarks) -> Tuple[float, float]:
         nose = np.array(landmarks.nose_tip)
@@ -52,29 +56,18 @@ class AttentionAnalyzer(BaseAnalyzer):
         return pitch, yaw
 
     def _smooth_pose(self, pitch: float, yaw: float) -> Tuple[float, float]:
-        self._pose_history.append((pitch, yaw))
-        
-        if len(self._pose_history) < 2:
-            return pitch, yaw
-            
-        pitches = [p[0] for p in self._pose_history]
-        yaws = [p[1] for p in self._pose_history]
-        
-        return np.median(pitches), np.median(yaws)
+        return self._pitch_filter.update(pitch), self._yaw_filter.update(yaw)
 
     def _calibrate(self, pitch: float, yaw: float):
-        self._calibration_frames.append((pitch, yaw))
-        
-        if len(self._calibration_frames) >= 30 and not self._is_calibrated:
-            pitches = [p[0] for p in self._calibration_frames]
-            yaws = [p[1] for p in self._calibration_frames]
-            
-            pitch_std = np.std(pitches)
-            yaw_std = np.std(yaws)
-            
-            if pitch_std < 15 and yaw_std < 15:
-                self._baseline_pitch = np.median(pitches)
-                self._baseline_yaw = np.median(yaws)
+        self._calibration_pitch.update(pitch)
+        self._calibration_yaw.update(yaw)
+        self._calibration_pitch_stats.update(pitch)
+        self._calibration_yaw_stats.update(yaw)
+        
+        if self._calibration_pitch.count >= 30 and not self._is_calibrated:
+            if self._calibration_pitch_stats.std < 15 and self._calibration_yaw_stats.std < 15:
+                self._baseline_pitch = self._calibration_pitch.median
+                self._baseline_yaw = self._calibration_yaw.median
                 self._is_calibrated = True
 
     def analyze(self, landmarks: FaceLandmarks) -> AttentionResult:
@@ -120,9 +113,13 @@ class AttentionAnalyzer(BaseAnalyzer):
     def reset_calibration(self):
         self._baseline_pitch = None
         self._baseline_yaw = None
-        self._calibration_frames.clear()
+        self._calibration_pitch.reset()
+        self._calibration_yaw.reset()
+        self._calibration_pitch_stats.reset()
+        self._calibration_yaw_stats.reset()
         self._is_calibrated = False
-        self._pose_history.clear()
+        self._pitch_filter.reset()
+        self._yaw_filter.reset()
         self._not_looking_counter = 0
         
     def update_image_size(self, width: int, height: int):
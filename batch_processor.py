@@ -0,0 +1,149 @@
+import os
+import cv2
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from config import AppConfig
+from analysis_pipeline import AnalysisPipeline
+from state_timeline import StateTimeline
+
+
+@dataclass
+class SegmentJob:
+    path: str
+    start_frame: int
+    end_frame: int
+    warmup_start_frame: int
+    fps: float
+    stride: int
+    config: AppConfig
+
+
+def plan_segments(
+    path: str,
+    config: AppConfig,
+    segment_seconds: float,
+    warmup_seconds: float,
+    stride: int
+) -> List[SegmentJob]:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"No se pudo abrir el video: {path}")
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+
+    segment_frames = max(1, int(segment_seconds * fps))
+    warmup_frames = int(warmup_seconds * fps)
+    jobs = []
+    for start in range(0, total_frames, segment_frames):
+        jobs.append(SegmentJob(
+            path=path,
+            start_frame=start,
+            end_frame=min(total_frames, start + segment_frames),
+            warmup_start_frame=max(0, start - warmup_frames),
+            fps=fps,
+            stride=max(1, stride),
+            config=config
+        ))
+    return jobs
+
+
+def process_segment(job: SegmentJob) -> Dict[str, np.ndarray]:
+    cv2.setNumThreads(1)
+    pipeline = AnalysisPipeline(job.config)
+    cap = cv2.VideoCapture(job.path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, job.warmup_start_frame)
+    pipeline.update_image_size(
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    )
+
+    timeline = StateTimeline(capacity=(job.end_frame - job.start_frame) // job.stride + 1)
+    try:
+        for frame_index in range(job.warmup_start_frame, job.end_frame):
+            if frame_index % job.stride != 0:
+                if not cap.grab():
+                    break
+                continue
+
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            state, _ = pipeline.process(frame)
+            if frame_index >= job.start_frame:
+                timeline.append(state, frame_index, frame_index / job.fps)
+    finally:
+        cap.release()
+        pipeline.release()
+
+    return timeline.to_columns()
+
+
+def process_videos(
+    paths: List[str],
+    output_dir: str,
+    config: AppConfig = None,
+    workers: int = None,
+    segment_seconds: float = 300.0,
+    warmup_seconds: float = 10.0,
+    stride: int = 1
+) -> List[str]:
+    config = config or AppConfig()
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    plans = {path: plan_segments(path, config, segment_seconds, warmup_seconds, stride) for path in paths}
+    total_segments = sum(len(jobs) for jobs in plans.values())
+    print(f"[INFO] {len(paths)} video(s), {total_segments} segmento(s), {workers} proceso(s)")
+
+    outputs = []
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {path: [executor.submit(process_segment, job) for job in jobs] for path, jobs in plans.items()}
+
+        for path, segment_futures in futures.items():
+            parts = [future.result() for future in segment_futures]
+            columns = StateTimeline.concatenate(parts) if parts else StateTimeline().to_columns()
+            output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + ".npz")
+            StateTimeline.save(output_path, columns)
+            outputs.append(output_path)
+            print(f"[INFO] {path}: {len(columns['frame'])} frames -> {output_path}")
+
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] Procesamiento terminado en {elapsed:.1f} s")
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Procesamiento por lotes de videos grabados (sin ventana)")
+    parser.add_argument("videos", nargs="+", help="Archivos de video a analizar")
+    parser.add_argument("-o", "--output", default="resultados", help="Directorio de salida (.npz por video)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Procesos en paralelo (por defecto: nucleos)")
+    parser.add_argument("--segment-seconds", type=float, default=300.0, help="Duracion de cada segmento")
+    parser.add_argument("--warmup-seconds", type=float, default=10.0, help="Frames previos procesados para calentar los contadores")
+    parser.add_argument("--stride", type=int, default=1, help="Procesar uno de cada N frames")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="Hilos de inferencia por proceso")
+    args = parser.parse_args()
+
+    config = AppConfig()
+    config.emotion.num_threads = args.threads_per_worker
+    process_videos(
+        args.videos,
+        args.output,
+        config=config,
+        workers=args.workers,
+        segment_seconds=args.segment_seconds,
+        warmup_seconds=args.warmup_seconds,
+        stride=args.stride
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
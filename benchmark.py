@@ -0,0 +1,331 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import cv2
+import numpy as np
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from config import AppConfig, EmotionConfig
+
+
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080)
+}
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    throughput: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    alloc_peak_kb: float
+    net_blocks_per_call: float
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 60, size=(height, width, 3), dtype=np.uint8)
+    center = (width // 2, height // 2)
+    axes = (width // 8, height // 4)
+    cv2.ellipse(frame, center, axes, 0, 0, 360, (170, 190, 210), -1)
+    cv2.circle(frame, (center[0] - axes[0] // 2, center[1] - axes[1] // 4), axes[0] // 6, (40, 40, 40), -1)
+    cv2.circle(frame, (center[0] + axes[0] // 2, center[1] - axes[1] // 4), axes[0] // 6, (40, 40, 40), -1)
+    cv2.ellipse(frame, (center[0], center[1] + axes[1] // 2), (axes[0] // 2, axes[1] // 10), 0, 0, 360, (60, 60, 140), -1)
+    return frame
+
+
+def synthetic_landmarks(frames: int, points: int = 478, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    template = np.empty((points, 3), dtype=np.float32)
+    template[:, 0] = rng.uniform(0.35, 0.65, points)
+    template[:, 1] = rng.uniform(0.25, 0.75, points)
+    template[:, 2] = rng.uniform(-0.05, 0.05, points)
+    drift = np.sin(np.linspace(0, 6 * np.pi, frames, dtype=np.float32))[:, None, None] * 0.01
+    noise = rng.normal(0, 0.002, size=(frames, points, 3)).astype(np.float32)
+    return template[None] + drift + noise
+
+
+def load_fixture(path: str) -> Tuple[np.ndarray, Tuple[int, int]]:
+    with np.load(path) as data:
+        fixture = {name: data[name] for name in data.files}
+    if "landmark_indices" not in fixture:
+        return fixture["landmarks"], (int(fixture["width"]), int(fixture["height"]))
+
+    from landmark_trace import FLAG_LANDMARKS
+
+    selected = np.flatnonzero(fixture["flags"] & FLAG_LANDMARKS)
+    if selected.size == 0:
+        raise ValueError(f"La traza no contiene landmarks: {path}")
+    meshes = np.zeros((selected.size, int(fixture["num_points"]), 3), dtype=np.float32)
+    meshes[:, fixture["landmark_indices"]] = fixture["landmarks"][selected]
+    width, height = fixture["image_size"][selected[0]]
+    return meshes, (int(width), int(height))
+
+
+def measure(name: str, fn: Callable[[int], object], iterations: int, warmup: int) -> BenchmarkResult:
+    for i in range(warmup):
+        fn(i)
+
+    times = np.empty(iterations)
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        times[i] = time.perf_counter() - started
+
+    traced_calls = min(iterations, 50)
+    peaks = np.empty(traced_calls)
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for i in range(traced_calls):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(i)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks[i] = peak - baseline
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+
+    times_ms = times * 1000.0
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        throughput=iterations / times.sum() if times.sum() > 0 else 0.0,
+        mean_ms=float(times_ms.mean()),
+        p50_ms=float(np.percentile(times_ms, 50)),
+        p95_ms=float(np.percentile(times_ms, 95)),
+        p99_ms=float(np.percentile(times_ms, 99)),
+        alloc_peak_kb=float(peaks.mean() / 1024.0),
+        net_blocks_per_call=(blocks_after - blocks_before) / traced_calls
+    )
+
+
+class BenchmarkSuite:
+    def __init__(
+        self,
+        config: AppConfig = None,
+        iterations: int = 200,
+        warmup: int = 10,
+        landmarks: Optional[np.ndarray] = None,
+        landmark_size: tuple = (640, 480),
+        stub_emotion: bool = True
+    ):
+        self._config = config or AppConfig()
+        if stub_emotion:
+            self._config.emotion = EmotionConfig(backend="stub")
+        self._iterations = iterations
+        self._warmup = warmup
+        self._landmarks = landmarks if landmarks is not None else synthetic_landmarks(256)
+        self._landmark_size = landmark_size
+        self._frames = {name: synthetic_frame(w, h) for name, (w, h) in RESOLUTIONS.items()}
+
+    def cases(self) -> Dict[str, Callable[[], Callable[[int], object]]]:
+        cases = {f"detector.detect[{name}]": self._detector_case(name) for name in RESOLUTIONS}
+        cases.update({
+            "landmarks.extract": self._landmark_case,
+            "drowsiness.analyze": self._drowsiness_case,
+            "attention.analyze": self._attention_case,
+            "emotion.predict": self._emotion_case,
+            "emotion.preprocess": self._emotion_preprocess_case,
+            "aggregator.aggregate": self._aggregator_case,
+            "renderer.render": self._renderer_case,
+            "renderer.render[in_place]": self._renderer_in_place_case,
+            "pipeline.process": self._pipeline_case
+        })
+        return cases
+
+    def run(self, only: Optional[List[str]] = None) -> Dict[str, Dict[str, object]]:
+        results = {}
+        for name, factory in self.cases().items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            try:
+                fn = factory()
+            except ImportError as e:
+                print(f"[SKIP] {name}: {e}")
+                continue
+            result = measure(name, fn, self._iterations, self._warmup)
+            results[name] = asdict(result)
+            print(
+                f"[BENCH] {name:<28} {result.throughput:9.1f} it/s | p50 {result.p50_ms:8.3f} ms | "
+                f"p95 {result.p95_ms:8.3f} ms | p99 {result.p99_ms:8.3f} ms | alloc {result.alloc_peak_kb:9.1f} KB"
+            )
+        return results
+
+    def _face_landmarks(self, i: int):
+        from landmark_extractor import FaceLandmarks
+        width, height = self._landmark_size
+        return FaceLandmarks(self._landmarks[i % len(self._landmarks)], width, height)
+
+    def _detector_case(self, resolution: str) -> Callable[[], Callable[[int], object]]:
+        def factory():
+            from face_detector import FaceDetector
+            detector = FaceDetector(self._config.detector)
+            frame = self._frames[resolution]
+            return lambda i: detector.detect(frame)
+        return factory
+
+    def _landmark_case(self):
+        from landmark_extractor import LandmarkExtractor
+        extractor = LandmarkExtractor()
+        frame = self._frames["480p"]
+        return lambda i: extractor.extract(frame)
+
+    def _drowsiness_case(self):
+        from drowsiness_analyzer import DrowsinessAnalyzer
+        analyzer = DrowsinessAnalyzer(self._config.drowsiness)
+        landmarks = [self._face_landmarks(i) for i in range(len(self._landmarks))]
+        return lambda i: analyzer.analyze(landmarks[i % len(landmarks)])
+
+    def _attention_case(self):
+        from attention_analyzer import AttentionAnalyzer
+        analyzer = AttentionAnalyzer(self._config.attention)
+        landmarks = [self._face_landmarks(i) for i in range(len(self._landmarks))]
+        return lambda i: analyzer.analyze(landmarks[i % len(landmarks)])
+
+    def _emotion_case(self):
+        from emotion_classifier import EmotionClassifier
+        classifier = EmotionClassifier(self._config.emotion)
+        crop = cv2.resize(self._frames["480p"][120:360, 240:400], (200, 240))
+        return lambda i: classifier.predict(crop)
+
+    def _emotion_preprocess_case(self):
+        from inference_backends import FacePreprocessor
+        preprocessor = FacePreprocessor(224, channels_last=False)
+        crop = self._frames["480p"][120:360, 240:400]
+        return lambda i: preprocessor(crop)
+
+    def _sample_state(self):
+        from drowsiness_analyzer import DrowsinessResult
+        from attention_analyzer import AttentionResult
+        from state_aggregator import StateAggregator
+        scores = {"Anger": 2.0, "Contempt": 1.0, "Disgust": 1.0, "Fear": 3.0,
+                  "Happiness": 10.0, "Neutral": 75.0, "Sadness": 5.0, "Surprise": 3.0}
+        return StateAggregator().aggregate(
+            face_detected=True,
+            cognitive_state="concentrado",
+            emotion="Neutral",
+            confidence=0.75,
+            emotion_scores=scores,
+            drowsiness=DrowsinessResult(0.3, 0.2, False, False, 0, 0),
+            attention=AttentionResult(2.0, -3.0, 0.0, True, 0)
+        )
+
+    def _aggregator_case(self):
+        from state_aggregator import StateAggregator
+        state = self._sample_state()
+        aggregator = StateAggregator()
+        return lambda i: aggregator.aggregate(
+            face_detected=True,
+            cognitive_state=state.cognitive_state,
+            emotion=state.emotion,
+            confidence=state.confidence,
+            emotion_scores=state.emotion_scores,
+            drowsiness=state.drowsiness,
+            attention=state.attention
+        )
+
+    def _renderer_case(self):
+        from display_renderer import DisplayRenderer
+        renderer = DisplayRenderer(self._config.display)
+        renderer.toggle_details()
+        state = self._sample_state()
+        frame = self._frames["480p"]
+        return lambda i: renderer.render(frame, state, (240, 120, 160, 240))
+
+    def _renderer_in_place_case(self):
+        from display_renderer import DisplayRenderer
+        renderer = DisplayRenderer(self._config.display)
+        renderer.toggle_details()
+        state = self._sample_state()
+        frame = self._frames["480p"].copy()
+        return lambda i: renderer.render(frame, state, (240, 120, 160, 240), in_place=True)
+
+    def _pipeline_case(self):
+        from analysis_pipeline import AnalysisPipeline
+        pipeline = AnalysisPipeline(self._config)
+        frame = self._frames["480p"]
+        pipeline.update_image_size(frame.shape[1], frame.shape[0])
+        return lambda i: pipeline.process(frame)
+
+
+def compare(results: Dict[str, Dict[str, object]], baseline: Dict[str, Dict[str, object]], tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "alloc_peak_kb"):
+            limit = reference[metric] * (1 + tolerance)
+            if metric == "alloc_peak_kb":
+                limit += 1.0
+            if result[metric] > limit:
+                regressions.append(f"{name}.{metric}: {result[metric]:.3f} > {reference[metric]:.3f} (+{tolerance:.0%})")
+    return regressions
+
+
+def environment() -> Dict[str, object]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa del sistema de analisis")
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="Llamadas medidas por caso")
+    parser.add_argument("--warmup", type=int, default=10, help="Llamadas de calentamiento por caso")
+    parser.add_argument("--only", default=None, help="Prefijos de casos separados por coma (ej: detector,drowsiness)")
+    parser.add_argument("--fixture", default=None, help="Traza .npz grabada con --trace (o .npz con landmarks, width, height)")
+    parser.add_argument("--real-emotion", action="store_true", help="Usar el backend de emociones configurado en lugar del stub")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="JSON de referencia para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Regresion permitida respecto a la referencia")
+    args = parser.parse_args()
+
+    landmarks = None
+    landmark_size = (640, 480)
+    if args.fixture:
+        landmarks, landmark_size = load_fixture(args.fixture)
+
+    suite = BenchmarkSuite(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        landmarks=landmarks,
+        landmark_size=landmark_size,
+        stub_emotion=not args.real_emotion
+    )
+    only = args.only.split(",") if args.only else None
+    results = suite.run(only)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    print(f"[INFO] Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"[REGRESION] {regression}")
+        if regressions:
+            sys.exit(1)
+        print("[INFO] Sin regresiones respecto a la referencia")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,5 +1,16 @@
 from dataclasses import dataclass
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
+
+
+@dataclass
+class CaptureConfig:
+    source: int = 0
+    threaded: bool = False
+    buffer_size: int = 2
+    read_timeout: float = 1.0
+    shared_memory: bool = False
+    shared_slots: int = 4
+    shared_pinned_frames: int = 1
 
 
 @dataclass
@@ -8,6 +19,15 @@ class DetectorConfig:
     scale_factor: float = 1.1
     min_neighbors: int = 5
     face_padding: float = 0.2
+    tracking: bool = False
+    tracking_min_visibility: float = 0.9
+    tracking_min_size_ratio: float = 0.75
+    roi_search: bool = False
+    roi_expansion: float = 0.5
+    roi_size_tolerance: float = 0.35
+    roi_target_face_size: int = 64
+    roi_max_misses: int = 3
+    full_scan_max_width: int = 640
 
 
 @dataclass
@@ -29,8 +49,54 @@ class AttentionConfig:
 class EmotionConfig:
     model_name: str = "enet_b0_8_best_afew"
     device: str = "cpu"
+    backend: str = "torch"
+    model_path: Optional[str] = None
+    num_threads: int = 0
+    max_batch_size: int = 8
+    max_batch_wait_ms: float = 5.0
+    gating: str = "off"
+    gate_landmark_threshold: float = 0.02
+    gate_crop_threshold: float = 0.04
+    gate_max_age: int = 10
     history_size: int = 15
     min_history_for_smoothing: int = 3
+    score_ema_alpha: float = 0.0
+    model_cache: bool = False
+    cache_dir: Optional[str] = None
+    export_opset: int = 13
+    export_simplify: bool = True
+    quantize: str = "none"
+    calibration_dir: Optional[str] = None
+    calibration_method: str = "minmax"
+    calibration_limit: Optional[int] = None
+
+
+@dataclass
+class SchedulerConfig:
+    enabled: bool = False
+    frame_budget_ms: float = 30.0
+    critical_stages: Tuple[str, ...] = ("landmarks", "drowsiness")
+    max_cadence: int = 8
+    adapt_every_n_frames: int = 15
+    latency_smoothing: float = 0.2
+
+
+@dataclass
+class MetricsConfig:
+    enabled: bool = False
+    http_host: str = "127.0.0.1"
+    http_port: int = 9108
+    log_interval_seconds: float = 60.0
+
+
+@dataclass
+class OutputConfig:
+    headless: bool = False
+    state_output: str = "-"
+    transitions_only: bool = False
+    journal_path: Optional[str] = None
+    journal_batch_size: int = 256
+    trace_path: Optional[str] = None
 
 
 @dataclass
@@ -38,6 +104,8 @@ class DisplayConfig:
     state_colors: Dict[str, Tuple[int, int, int]] = None
     font_scale: float = 0.7
     font_thickness: int = 2
+    in_place: bool = False
+    panel_opacity: float = 1.0
     
     def __post_init__(self):
         if self.state_colors is None:
@@ -54,14 +122,23 @@ class DisplayConfig:
 
 @dataclass
 class AppConfig:
+    capture: CaptureConfig = None
     detector: DetectorConfig = None
     drowsiness: DrowsinessConfig = None
     attention: AttentionConfig = None
     emotion: EmotionConfig = None
     display: DisplayConfig = None
+    scheduler: SchedulerConfig = None
+    metrics: MetricsConfig = None
+    output: OutputConfig = None
     process_every_n_frames: int = 2
+    pipelined: bool = False
+    pipeline_queue_size: int = 2
+    background_init: bool = False
     
     def __post_init__(self):
+        if self.capture is None:
+            self.capture = CaptureConfig()
         if self.detector is None:
             self.detector = DetectorConfig()
         if self.drowsiness is None:
@@ -71,4 +148,10 @@ class AppConfig:
         if self.emotion is None:
             self.emotion = EmotionConfig()
         if self.display is None:
-            self.display = DisplayConfig()
\ No newline at end of file
+            self.display = DisplayConfig()
+        if self.scheduler is None:
+            self.scheduler = SchedulerConfig()
+        if self.metrics is None:
+            self.metrics = MetricsConfig()
+        if self.output is None:
+            self.output = OutputConfig()
\ No newline at end of file
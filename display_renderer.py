@@ -1,10 +1,13 @@
 import cv2
 import numpy as np
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from config import DisplayConfig
 from state_aggregator import CombinedState
 
 
+TextCommand = Tuple[str, Tuple[int, int], float, Tuple[int, int, int], int]
+
+
 class DisplayRenderer:
     STATE_LABELS = {
         "concentrado": "CONCENTRADO",
@@ -17,9 +20,18 @@ class DisplayRenderer:
         "desconocido": "DESCONOCIDO"
     }
 
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+
     def __init__(self, config: DisplayConfig = None):
         self._config = config or DisplayConfig()
         self._show_details = False
+        self._panel_state: Optional[CombinedState] = None
+        self._panel_details = False
+        self._panel_commands: List[TextCommand] = []
+        self._panel: Optional[np.ndarray] = None
+        self._panel_mask: Optional[np.ndarray] = None
+        self._blend: Optional[np.ndarray] = None
+        self._rasterized = 0
 
     def toggle_details(self):
         self._show_details = not self._show_details
@@ -28,93 +40,125 @@ class DisplayRenderer:
         self,
         frame: np.ndarray,
         state: CombinedState,
-        bbox: Optional[Tuple[int, int, int, int]] = None
+        bbox: Optional[Tuple[int, int, int, int]] = None,
+        in_place: Optional[bool] = None
     ) -> np.ndarray:
-        display = frame.copy()
-        
+        in_place = self._config.in_place if in_place is None else in_place
+        display = frame if in_place else frame.copy()
+
         if bbox and state.face_detected:
             color = self._config.state_colors.get(state.final_state, (255, 255, 255))
             x, y, w, h = bbox
             cv2.rectangle(display, (x, y), (x + w, y + h), color, 2)
-        
+
+        self._update_panel(state)
+        self._blit_panel(display)
+        return display
+
+    def _update_panel(self, state: CombinedState):
+        if state is self._panel_state and self._show_details == self._panel_details:
+            return
+        self._panel_state = state
+        self._panel_details = self._show_details
+
+        commands = self._layout(state)
+        if commands == self._panel_commands and self._panel is not None:
+            return
+        self._panel_commands = commands
+        self._rasterize(commands)
+
+    def _layout(self, state: CombinedState) -> List[TextCommand]:
+        commands: List[TextCommand] = []
         y_offset = 30
-        
+
+        if state.warming_up:
+            commands.append(("Cargando modelos...", (10, y_offset), 0.8, (255, 255, 0), 2))
+            return commands
+
         if not state.face_detected:
-            cv2.putText(
-                display, "Sin rostro detectado", (10, y_offset),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2
-            )
-            return display
-        
+            commands.append(("Sin rostro detectado", (10, y_offset), 0.8, (0, 0, 255), 2))
+            return commands
+
         color = self._config.state_colors.get(state.final_state, (255, 255, 255))
         label = self.STATE_LABELS.get(state.final_state, state.final_state.upper())
-        
-        cv2.putText(
-            display, f"Estado: {label}", (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2
-        )
+
+        commands.append((f"Estado: {label}", (10, y_offset), 0.9, color, 2))
         y_offset += 35
-        
-        cv2.putText(
-            display, f"Confianza: {state.confidence:.0%}", (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX, self._config.font_scale, color, 2
-        )
+
+        commands.append((f"Confianza: {state.confidence:.0%}", (10, y_offset), self._config.font_scale, color, 2))
         y_offset += 30
-        
-        cv2.putText(
-            display, f"Emocion: {state.emotion}", (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1
-        )
+
+        commands.append((f"Emocion: {state.emotion}", (10, y_offset), 0.6, (255, 255, 255), 1))
         y_offset += 25
-        
+
         if state.drowsiness:
             ear_color = (0, 255, 0) if state.drowsiness.ear >= 0.22 else (0, 0, 255)
-            cv2.putText(
-                display, f"EAR: {state.drowsiness.ear:.2f}", (10, y_offset),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, ear_color, 1
-            )
+            commands.append((f"EAR: {state.drowsiness.ear:.2f}", (10, y_offset), 0.5, ear_color, 1))
             y_offset += 20
-            
+
             if state.drowsiness.is_yawning:
-                cv2.putText(
-                    display, "BOSTEZANDO", (10, y_offset),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 165, 255), 2
-                )
+                commands.append(("BOSTEZANDO", (10, y_offset), 0.6, (0, 165, 255), 2))
                 y_offset += 25
-        
+
         if state.attention:
             if not state.attention.is_looking_at_screen:
-                cv2.putText(
-                    display, "NO ESTA MIRANDO LA PANTALLA", (10, y_offset),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 100, 100), 2
-                )
+                commands.append(("NO ESTA MIRANDO LA PANTALLA", (10, y_offset), 0.7, (100, 100, 100), 2))
                 y_offset += 25
-        
+
         if hasattr(state, 'calibrating') and state.calibrating:
-            cv2.putText(
-                display, "Calibrando... mire a la pantalla", (10, y_offset),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2
-            )
+            commands.append(("Calibrando... mire a la pantalla", (10, y_offset), 0.6, (255, 255, 0), 2))
             y_offset += 25
-        
+
         if self._show_details and state.emotion_scores:
             y_offset += 10
-            cv2.putText(
-                display, "--- Detalles ---", (10, y_offset),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1
-            )
+            commands.append(("--- Detalles ---", (10, y_offset), 0.5, (150, 150, 150), 1))
             y_offset += 20
-            
+
             sorted_emotions = sorted(
                 state.emotion_scores.items(),
                 key=lambda x: x[1],
                 reverse=True
             )
             for emo, score in sorted_emotions:
-                cv2.putText(
-                    display, f"{emo}: {score:.1f}%", (10, y_offset),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (200, 200, 200), 1
-                )
+                commands.append((f"{emo}: {score:.1f}%", (10, y_offset), 0.45, (200, 200, 200), 1))
                 y_offset += 18
-        
-        return display
\ No newline at end of file
+
+        return commands
+
+    def _rasterize(self, commands: List[TextCommand]):
+        width, height = 1, 1
+        for text, (x, y), scale, _, thickness in commands:
+            (text_w, _), baseline = cv2.getTextSize(text, self.FONT, scale, thickness)
+            width = max(width, x + text_w + thickness + 1)
+            height = max(height, y + baseline + thickness + 1)
+
+        self._panel = np.zeros((height, width, 3), dtype=np.uint8)
+        self._panel_mask = np.zeros((height, width), dtype=np.uint8)
+        self._blend = np.empty_like(self._panel) if self._config.panel_opacity < 1.0 else None
+        for text, org, scale, color, thickness in commands:
+            cv2.putText(self._panel, text, org, self.FONT, scale, color, thickness)
+            cv2.putText(self._panel_mask, text, org, self.FONT, scale, 255, thickness)
+        self._rasterized += 1
+
+    def _blit_panel(self, display: np.ndarray):
+        if self._panel is None:
+            return
+        height = min(self._panel.shape[0], display.shape[0])
+        width = min(self._panel.shape[1], display.shape[1])
+        roi = display[:height, :width]
+        panel = self._panel[:height, :width]
+        mask = self._panel_mask[:height, :width]
+
+        if self._blend is not None:
+            blend = self._blend[:height, :width]
+            opacity = self._config.panel_opacity
+            panel = cv2.addWeighted(roi, 1.0 - opacity, panel, opacity, 0.0, dst=blend)
+        cv2.copyTo(panel, mask, roi)
+
+    @property
+    def show_details(self) -> bool:
+        return self._show_details
+
+    @property
+    def rasterized_panels(self) -> int:
+        return self._rasterized
\ No newline at end of file
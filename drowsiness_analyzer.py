@@ -1,5 +1,4 @@
 import numpy as np
-from typing import Tuple, List
 from dataclasses import dataclass
 from interfaces import BaseAnalyzer
 from config import DrowsinessConfig
@@ -16,53 +15,78 @@ class DrowsinessResult:
     yawn_frames: int
 
 
+@dataclass
+class DrowsinessSequenceResult:
+    ear: np.ndarray
+    mar: np.ndarray
+    is_drowsy: np.ndarray
+    is_yawning: np.ndarray
+    drowsy_frames: np.ndarray
+    yawn_frames: np.ndarray
+
+
+def _distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.sum((a - b) ** 2, axis=-1))
+
+
+def eye_aspect_ratio(eyes: np.ndarray) -> np.ndarray:
+    vertical_1 = _distance(eyes[..., 1, :], eyes[..., 5, :])
+    vertical_2 = _distance(eyes[..., 2, :], eyes[..., 4, :])
+    horizontal = _distance(eyes[..., 0, :], eyes[..., 3, :])
+    return np.divide(
+        vertical_1 + vertical_2, 2.0 * horizontal,
+        out=np.zeros_like(horizontal), where=horizontal != 0
+    )
+
+
+def mouth_aspect_ratio(mouth: np.ndarray) -> np.ndarray:
+    vertical = _distance(mouth[..., 2, :], mouth[..., 3, :])
+    horizontal = _distance(mouth[..., 0, :], mouth[..., 1, :])
+    return np.divide(
+        vertical, horizontal,
+        out=np.zeros_like(horizontal), where=horizontal != 0
+    )
+
+
+def hysteresis_counter(condition: np.ndarray, initial: int = 0, decay: int = 1) -> np.ndarray:
+    steps = np.where(condition, 1, -decay).cumsum(axis=-1)
+    return steps - np.minimum(np.minimum.accumulate(steps, axis=-1), -initial)
+
+
 class DrowsinessAnalyzer(BaseAnalyzer):
+    EYE_INDICES = np.stack([FaceLandmarks.LEFT_EYE_INDICES, FaceLandmarks.RIGHT_EYE_INDICES])
+    MOUTH_INDICES = FaceLandmarks.MOUTH_INDICES
+    PAIR_STARTS = np.concatenate([EYE_INDICES[:, [1, 2, 0]].ravel(), MOUTH_INDICES[[2, 0]]])
+    PAIR_ENDS = np.concatenate([EYE_INDICES[:, [5, 4, 3]].ravel(), MOUTH_INDICES[[3, 1]]])
+
     def __init__(self, config: DrowsinessConfig = None):
         self._config = config or DrowsinessConfig()
         self._drowsy_counter = 0
         self._yawn_counter = 0
 
-    def _calculate_ear(self, eye_points: List[Tuple[float, float]]) -> float:
-        p1, p2, p3, p4, p5, p6 = eye_points
-        vertical_1 = np.linalg.norm(np.array(p2) - np.array(p6))
-        vertical_2 = np.linalg.norm(np.array(p3) - np.array(p5))
-        horizontal = np.linalg.norm(np.array(p1) - np.array(p4))
-        if horizontal == 0:
-            return 0.0
-        return (vertical_1 + vertical_2) / (2.0 * horizontal)
-
-    def _calculate_mar(self, mouth_points: List[Tuple[float, float]]) -> float:
-        if len(mouth_points) < 8:
-            return 0.0
-        p_top = np.array(mouth_points[2])
-        p_bottom = np.array(mouth_points[3])
-        p_left = np.array(mouth_points[0])
-        p_right = np.array(mouth_points[1])
-        vertical = np.linalg.norm(p_top - p_bottom)
-        horizontal = np.linalg.norm(p_left - p_right)
-        if horizontal == 0:
-            return 0.0
-        return vertical / horizontal
-
     def analyze(self, landmarks: FaceLandmarks) -> DrowsinessResult:
-        left_ear = self._calculate_ear(landmarks.left_eye)
-        right_ear = self._calculate_ear(landmarks.right_eye)
-        ear = (left_ear + right_ear) / 2.0
-        mar = self._calculate_mar(landmarks.mouth)
-        
+        points = landmarks.points
+        delta = points[self.PAIR_STARTS] - points[self.PAIR_ENDS]
+        distances = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        left_v1, left_v2, left_h, right_v1, right_v2, right_h, mouth_v, mouth_h = distances
+        left_ear = (left_v1 + left_v2) / (2.0 * left_h) if left_h != 0 else distances.dtype.type(0)
+        right_ear = (right_v1 + right_v2) / (2.0 * right_h) if right_h != 0 else distances.dtype.type(0)
+        ear = float((left_ear + right_ear) / 2)
+        mar = float(mouth_v / mouth_h) if mouth_h != 0 else 0.0
+
         if ear < self._config.ear_threshold:
             self._drowsy_counter += 1
         else:
             self._drowsy_counter = max(0, self._drowsy_counter - 1)
-            
+
         if mar > self._config.mar_threshold:
             self._yawn_counter += 1
         else:
             self._yawn_counter = max(0, self._yawn_counter - 1)
-        
+
         is_drowsy = self._drowsy_counter >= self._config.drowsy_frames_threshold
         is_yawning = self._yawn_counter >= self._config.yawn_frames_threshold
-        
+
         return DrowsinessResult(
             ear=ear,
             mar=mar,
@@ -72,6 +96,28 @@ class DrowsinessAnalyzer(BaseAnalyzer):
             yawn_frames=self._yawn_counter
         )
 
+    def analyze_sequence(self, points: np.ndarray, update_state: bool = True) -> DrowsinessSequenceResult:
+        ear = eye_aspect_ratio(points[:, self.EYE_INDICES]).mean(axis=1)
+        mar = mouth_aspect_ratio(points[:, self.MOUTH_INDICES])
+        return self.analyze_metrics(ear, mar, update_state)
+
+    def analyze_metrics(self, ear: np.ndarray, mar: np.ndarray, update_state: bool = True) -> DrowsinessSequenceResult:
+        drowsy_frames = hysteresis_counter(ear < self._config.ear_threshold, self._drowsy_counter)
+        yawn_frames = hysteresis_counter(mar > self._config.mar_threshold, self._yawn_counter)
+
+        if update_state and len(ear) > 0:
+            self._drowsy_counter = int(drowsy_frames[-1])
+            self._yawn_counter = int(yawn_frames[-1])
+
+        return DrowsinessSequenceResult(
+            ear=ear,
+            mar=mar,
+            is_drowsy=drowsy_frames >= self._config.drowsy_frames_threshold,
+            is_yawning=yawn_frames >= self._config.yawn_frames_threshold,
+            drowsy_frames=drowsy_frames,
+            yawn_frames=yawn_frames
+        )
+
     def reset(self):
         self._drowsy_counter = 0
         self._yawn_counter = 0
\ No newline at end of file
@@ -1,12 +1,17 @@
 import numpy as np
 from typing import Tuple, Dict
-from collections import deque
-from hsemotion.facial_emotions import HSEmotionRecognizer
-from interfaces import BaseClassifier
+from interfaces import BaseClassifier, BaseInferenceBackend
 from config import EmotionConfig
+from inference_backends import create_emotion_backend
+from streaming_filters import ExponentialMovingAverage, ModeCounter, RunningStats
 
 
 class EmotionClassifier(BaseClassifier):
+    EMOTION_LABELS = [
+        "Anger", "Contempt", "Disgust", "Fear",
+        "Happiness", "Neutral", "Sadness", "Surprise"
+    ]
+
     EMOTION_TO_COGNITIVE = {
         "Anger": "frustrado",
         "Contempt": "frustrado",
@@ -18,39 +23,38 @@ class EmotionClassifier(BaseClassifier):
         "Neutral": "concentrado"
     }
 
-    def __init__(self, config: EmotionConfig = None):
+    def __init__(self, config: EmotionConfig = None, backend: BaseInferenceBackend = None):
         self._config = config or EmotionConfig()
-        self._recognizer = HSEmotionRecognizer(
-            model_name=self._config.model_name,
-            device=self._config.device
-        )
-        self._emotion_history = deque(maxlen=self._config.history_size)
-        self._confidence_history = deque(maxlen=self._config.history_size)
+        self._backend = backend or create_emotion_backend(self._config)
+        self._emotion_history = ModeCounter(len(self.EMOTION_LABELS), self._config.history_size)
+        self._confidence_history = RunningStats(self._config.history_size)
+        self._score_filter = None
+        if self._config.score_ema_alpha > 0:
+            self._score_filter = ExponentialMovingAverage(len(self.EMOTION_LABELS), self._config.score_ema_alpha)
+
+    def warm_up(self):
+        self._backend.warm_up()
 
     def predict(self, face_crop: np.ndarray) -> Tuple[str, float, str, Dict[str, float]]:
-        emotion, scores = self._recognizer.predict_emotions(face_crop, logits=False)
-        
-        emotion_dict = {
-            "Anger": scores[0],
-            "Contempt": scores[1],
-            "Disgust": scores[2],
-            "Fear": scores[3],
-            "Happiness": scores[4],
-            "Neutral": scores[5],
-            "Sadness": scores[6],
-            "Surprise": scores[7]
-        }
+        return self.classify_scores(self.infer_scores(face_crop))
+
+    def infer_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        return self._backend.predict_scores(face_crop)
+
+    def classify_scores(self, scores: np.ndarray) -> Tuple[str, float, str, Dict[str, float]]:
+        if self._score_filter is not None:
+            scores = self._score_filter.update(scores)
+        index = int(np.argmax(scores))
+        emotion = self.EMOTION_LABELS[index]
+        emotion_dict = dict(zip(self.EMOTION_LABELS, scores))
         
         confidence = emotion_dict[emotion]
-        self._emotion_history.append(emotion)
-        self._confidence_history.append(confidence)
+        mode = self._emotion_history.update(index)
+        self._confidence_history.update(confidence)
         
-        if len(self._emotion_history) >= self._config.min_history_for_smoothing:
-            emotion_counts = {}
-            for e in self._emotion_history:
-                emotion_counts[e] = emotion_counts.get(e, 0) + 1
-            emotion = max(emotion_counts, key=emotion_counts.get)
-            confidence = np.mean(list(self._confidence_history))
+        if self._emotion_history.count >= self._config.min_history_for_smoothing:
+            emotion = self.EMOTION_LABELS[mode]
+            confidence = self._confidence_history.mean
         
         cognitive_state = self.EMOTION_TO_COGNITIVE.get(emotion, "concentrado")
         emotion_dict_percent = {k: v * 100 for k, v in emotion_dict.items()}
@@ -58,5 +62,7 @@ class EmotionClassifier(BaseClassifier):
         return cognitive_state, confidence, emotion, emotion_dict_percent
 
     def reset(self):
-        self._emotion_history.clear()
-        self._confidence_history.clear()
\ No newline at end of file
+        self._emotion_history.reset()
+        self._confidence_history.reset()
+        if self._score_filter is not None:
+            self._score_filter.reset()
\ No newline at end of file
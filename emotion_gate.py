@@ -0,0 +1,93 @@
+import cv2
+import numpy as np
+from typing import Optional
+from config import EmotionConfig
+from landmark_extractor import FaceLandmarks
+
+
+class EmotionGate:
+    EXPRESSION_INDICES = [
+        362, 385, 387, 263, 373, 380,
+        33, 160, 158, 133, 153, 144,
+        61, 291, 0, 17, 405, 321, 375, 78, 191, 80, 81, 82,
+        70, 63, 105, 66, 107,
+        336, 296, 334, 293, 300
+    ]
+    CROP_SIGNATURE_SIZE = (16, 16)
+
+    def __init__(self, config: EmotionConfig = None):
+        self._config = config or EmotionConfig()
+        self._cached_scores: Optional[np.ndarray] = None
+        self._cached_signature: Optional[np.ndarray] = None
+        self._pending_signature: Optional[np.ndarray] = None
+        self._age = 0
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, landmarks: Optional[FaceLandmarks], face_crop: np.ndarray) -> Optional[np.ndarray]:
+        signature = self._signature(landmarks, face_crop)
+        self._pending_signature = signature
+
+        if (
+            self._cached_scores is None or
+            signature is None or
+            self._cached_signature is None or
+            self._age >= self._config.gate_max_age or
+            self._distance(signature) > self._threshold()
+        ):
+            self._misses += 1
+            return None
+
+        self._age += 1
+        self._hits += 1
+        return self._cached_scores
+
+    def store(self, scores: np.ndarray):
+        self._cached_scores = scores
+        self._cached_signature = self._pending_signature
+        self._age = 0
+
+    def _signature(self, landmarks: Optional[FaceLandmarks], face_crop: np.ndarray) -> Optional[np.ndarray]:
+        if self._config.gating == "landmarks":
+            if landmarks is None:
+                return None
+            left = landmarks.left_eye_outer
+            right = landmarks.right_eye_outer
+            scale = float(np.linalg.norm(left - right))
+            if scale < 1:
+                return None
+            return (landmarks.points[self.EXPRESSION_INDICES] - (left + right) / 2) / scale
+
+        if face_crop is None or face_crop.size == 0:
+            return None
+        gray = cv2.cvtColor(face_crop, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, self.CROP_SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32) / 255.0
+
+    def _distance(self, signature: np.ndarray) -> float:
+        if self._config.gating == "landmarks":
+            return float(np.linalg.norm(signature - self._cached_signature, axis=1).mean())
+        return float(np.abs(signature - self._cached_signature).mean())
+
+    def _threshold(self) -> float:
+        if self._config.gating == "landmarks":
+            return self._config.gate_landmark_threshold
+        return self._config.gate_crop_threshold
+
+    def reset(self):
+        self._cached_scores = None
+        self._cached_signature = None
+        self._pending_signature = None
+        self._age = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.0
\ No newline at end of file
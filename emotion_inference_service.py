@@ -0,0 +1,143 @@
+import time
+import queue
+import threading
+import numpy as np
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from interfaces import BaseInferenceBackend
+from config import EmotionConfig
+from inference_backends import create_emotion_backend
+
+
+@dataclass
+class _InferenceRequest:
+    face_crop: np.ndarray
+    future: Future
+    enqueued_at: float
+
+
+class EmotionInferenceService:
+    _STOP = object()
+
+    def __init__(self, config: EmotionConfig = None, backend: BaseInferenceBackend = None):
+        self._config = config or EmotionConfig()
+        self._backend = backend or create_emotion_backend(self._config)
+        self._max_batch_size = max(1, self._config.max_batch_size)
+        self._max_wait = self._config.max_batch_wait_ms / 1000.0
+        self._requests = queue.Queue()
+        self._worker = None
+        self._running = False
+        self._lifecycle_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._wait_times: List[float] = []
+        self._max_wait_samples = 10000
+
+    def start(self):
+        with self._lifecycle_lock:
+            if self._running:
+                return
+            self._running = True
+            self._worker = threading.Thread(target=self._serve, name="EmotionInferenceService", daemon=True)
+            self._worker.start()
+
+    def submit(self, face_crop: np.ndarray) -> Future:
+        future = Future()
+        with self._lifecycle_lock:
+            if not self._running:
+                raise RuntimeError("El servicio de inferencia no esta iniciado")
+            self._requests.put(_InferenceRequest(face_crop, future, time.perf_counter()))
+        return future
+
+    def _serve(self):
+        while True:
+            first = self._requests.get()
+            if first is self._STOP:
+                break
+
+            batch = [first]
+            deadline = first.enqueued_at + self._max_wait
+            stop_requested = False
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._requests.get(timeout=remaining) if remaining > 0 else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop_requested = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+            if stop_requested:
+                break
+
+    def _run_batch(self, batch: List[_InferenceRequest]):
+        started_at = time.perf_counter()
+        with self._stats_lock:
+            self._batch_sizes[len(batch)] += 1
+            for request in batch:
+                self._wait_times.append(started_at - request.enqueued_at)
+            if len(self._wait_times) > self._max_wait_samples:
+                del self._wait_times[:len(self._wait_times) - self._max_wait_samples]
+
+        try:
+            scores = self._backend.predict_batch([request.face_crop for request in batch])
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, row in zip(batch, scores):
+            request.future.set_result(row)
+
+    def stop(self):
+        with self._lifecycle_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._requests.put(self._STOP)
+        self._worker.join()
+        self._worker = None
+
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                item.future.set_exception(RuntimeError("El servicio de inferencia se detuvo"))
+
+    def stats(self) -> Dict[str, object]:
+        with self._stats_lock:
+            batch_sizes = dict(sorted(self._batch_sizes.items()))
+            waits = np.array(self._wait_times) * 1000.0
+
+        total_batches = sum(batch_sizes.values())
+        total_requests = sum(size * count for size, count in batch_sizes.items())
+        return {
+            "batches": total_batches,
+            "requests": total_requests,
+            "mean_batch_size": total_requests / total_batches if total_batches else 0.0,
+            "batch_size_histogram": batch_sizes,
+            "queue_wait_ms_p50": float(np.percentile(waits, 50)) if waits.size else 0.0,
+            "queue_wait_ms_p95": float(np.percentile(waits, 95)) if waits.size else 0.0,
+            "queue_wait_ms_max": float(waits.max()) if waits.size else 0.0,
+            "pending": self._requests.qsize()
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+
+class ServiceBackend(BaseInferenceBackend):
+    def __init__(self, service: EmotionInferenceService, timeout: Optional[float] = None):
+        self._service = service
+        self._timeout = timeout
+
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        return self._service.submit(face_crop).result(timeout=self._timeout)
\ No newline at end of file
@@ -0,0 +1,312 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import importlib
+import argparse
+import tempfile
+import cv2
+import numpy as np
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterator, List, Optional
+from config import EmotionConfig
+from inference_backends import FacePreprocessor, OnnxEmotionBackend
+from emotion_classifier import EmotionClassifier
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+CALIBRATION_METHODS = ("minmax", "entropy", "percentile")
+
+
+def list_crops(directory: str, limit: Optional[int] = None) -> List[str]:
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    paths.sort()
+    if not paths:
+        raise FileNotFoundError(f"No hay recortes de rostros en {directory}")
+    return paths[:limit] if limit else paths
+
+
+def iter_crops(paths: List[str]) -> Iterator[np.ndarray]:
+    for path in paths:
+        crop = cv2.imread(path, cv2.IMREAD_COLOR)
+        if crop is not None:
+            yield crop
+
+
+def calibration_digest(directory: str) -> str:
+    digest = hashlib.sha256()
+    for path in list_crops(directory):
+        digest.update(os.path.relpath(path, directory).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+class FaceCropCalibrationReader:
+    def __init__(self, model_path: str, directory: str, limit: Optional[int] = None):
+        import onnxruntime as ort
+
+        session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        model_input = session.get_inputs()[0]
+        channels_last = model_input.shape[-1] == 3
+        size = model_input.shape[1] if channels_last else model_input.shape[2]
+        self._input_name = model_input.name
+        self._preprocessor = FacePreprocessor(size if isinstance(size, int) else 224, channels_last)
+        self._paths = list_crops(directory, limit)
+        self._crops: Optional[Iterator[np.ndarray]] = None
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        if self._crops is None:
+            self._crops = iter_crops(self._paths)
+        crop = next(self._crops, None)
+        if crop is None:
+            return None
+        return {self._input_name: self._preprocessor(crop).copy()}
+
+    def rewind(self):
+        self._crops = None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+def quantize_static_model(
+    float_path: str,
+    output_path: str,
+    calibration_dir: str,
+    limit: Optional[int] = None,
+    method: str = "minmax",
+    per_channel: bool = True
+):
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    methods = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile
+    }
+    if method not in methods:
+        raise ValueError(f"Metodo de calibracion desconocido: {method}")
+
+    reader = FaceCropCalibrationReader(float_path, calibration_dir, limit)
+    with tempfile.TemporaryDirectory() as staging:
+        prepared = os.path.join(staging, "prepared.onnx")
+        quant_pre_process(float_path, prepared)
+        quantize_static(
+            prepared,
+            output_path,
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=methods[method]
+        )
+
+
+@dataclass
+class ModelReport:
+    name: str
+    model_path: str
+    model_size_mb: float
+    load_ms: float
+    rss_delta_mb: Optional[float]
+    mean_ms: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+
+
+@dataclass
+class ComparisonReport:
+    crops: int
+    top1_agreement: float
+    mean_abs_deviation: float
+    max_abs_deviation: float
+    per_class_mean_deviation: Dict[str, float]
+    per_class_max_deviation: Dict[str, float]
+    speedup: float
+    models: List[ModelReport] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+
+def _rss() -> Optional[int]:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def _load_backend(name: str, model_path: str, num_threads: int):
+    rss_before = _rss()
+    started = time.perf_counter()
+    backend = OnnxEmotionBackend(EmotionConfig(backend="onnxruntime", model_path=model_path, num_threads=num_threads))
+    load_ms = (time.perf_counter() - started) * 1000
+    rss_after = _rss()
+    report = ModelReport(
+        name=name,
+        model_path=model_path,
+        model_size_mb=os.path.getsize(model_path) / (1024 * 1024),
+        load_ms=load_ms,
+        rss_delta_mb=(rss_after - rss_before) / (1024 * 1024) if rss_before is not None else None
+    )
+    return backend, report
+
+
+def _run_backend(backend, report: ModelReport, crops: List[np.ndarray], warmup: int) -> np.ndarray:
+    for crop in crops[:warmup]:
+        backend.predict_scores(crop)
+
+    scores = np.empty((len(crops), len(EmotionClassifier.EMOTION_LABELS)), dtype=np.float32)
+    times = np.empty(len(crops))
+    for i, crop in enumerate(crops):
+        started = time.perf_counter()
+        scores[i] = backend.predict_scores(crop)
+        times[i] = time.perf_counter() - started
+
+    times *= 1000
+    report.mean_ms = float(times.mean())
+    report.p50_ms = float(np.percentile(times, 50))
+    report.p95_ms = float(np.percentile(times, 95))
+    return scores
+
+
+def compare_models(
+    float_path: str,
+    int8_path: str,
+    crops_dir: str,
+    limit: Optional[int] = None,
+    min_agreement: float = 0.98,
+    max_deviation: float = 0.02,
+    num_threads: int = 0,
+    warmup: int = 10
+) -> ComparisonReport:
+    crops = list(iter_crops(list_crops(crops_dir, limit)))
+    if not crops:
+        raise ValueError(f"No se pudo leer ningun recorte en {crops_dir}")
+
+    importlib.import_module("onnxruntime")
+    float_backend, float_report = _load_backend("float32", float_path, num_threads)
+    float_scores = _run_backend(float_backend, float_report, crops, warmup)
+    del float_backend
+    int8_backend, int8_report = _load_backend("int8", int8_path, num_threads)
+    int8_scores = _run_backend(int8_backend, int8_report, crops, warmup)
+    del int8_backend
+
+    deviation = np.abs(int8_scores - float_scores)
+    agreement = float(np.mean(float_scores.argmax(axis=1) == int8_scores.argmax(axis=1)))
+    labels = EmotionClassifier.EMOTION_LABELS
+    report = ComparisonReport(
+        crops=len(crops),
+        top1_agreement=agreement,
+        mean_abs_deviation=float(deviation.mean()),
+        max_abs_deviation=float(deviation.max()),
+        per_class_mean_deviation=dict(zip(labels, deviation.mean(axis=0).tolist())),
+        per_class_max_deviation=dict(zip(labels, deviation.max(axis=0).tolist())),
+        speedup=float_report.mean_ms / int8_report.mean_ms if int8_report.mean_ms > 0 else 0.0,
+        models=[float_report, int8_report]
+    )
+
+    if agreement < min_agreement:
+        report.failures.append(f"coincidencia top-1 {agreement:.2%} < {min_agreement:.2%}")
+    for label, value in report.per_class_mean_deviation.items():
+        if value > max_deviation:
+            report.failures.append(f"desviacion media de {label} {value:.4f} > {max_deviation:.4f}")
+    return report
+
+
+def print_report(report: ComparisonReport):
+    print(f"[INFO] {report.crops} recortes comparados")
+    for model in report.models:
+        rss = f"{model.rss_delta_mb:7.1f} MB" if model.rss_delta_mb is not None else "    n/d"
+        print(
+            f"  {model.name:<8} {model.model_size_mb:6.1f} MB en disco | RSS +{rss} | carga {model.load_ms:7.1f} ms | "
+            f"media {model.mean_ms:7.3f} ms | p50 {model.p50_ms:7.3f} ms | p95 {model.p95_ms:7.3f} ms"
+        )
+    print(f"  Aceleracion INT8: {report.speedup:.2f}x")
+    print(f"  Coincidencia top-1: {report.top1_agreement:.2%}")
+    print(f"  Desviacion absoluta media: {report.mean_abs_deviation:.4f} (max {report.max_abs_deviation:.4f})")
+    for label in EmotionClassifier.EMOTION_LABELS:
+        print(
+            f"    {label:<10} media {report.per_class_mean_deviation[label]:.4f} | "
+            f"max {report.per_class_max_deviation[label]:.4f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cuantizacion INT8 del modelo de emociones y comparacion contra float32")
+    parser.add_argument("--calibration", required=True, help="Directorio de recortes de rostros para calibrar")
+    parser.add_argument("--eval", required=True, help="Directorio de recortes de rostros para comparar (distinto al de calibracion)")
+    parser.add_argument("--float", dest="float_path", default=None, help="Modelo ONNX float32 (por defecto: cache de modelos)")
+    parser.add_argument("--int8", dest="int8_path", default=None, help="Destino del modelo INT8 (por defecto: cache de modelos, o <float>_int8.onnx si se indica --float)")
+    parser.add_argument("--method", default="minmax", choices=CALIBRATION_METHODS, help="Metodo de calibracion")
+    parser.add_argument("--calibration-limit", type=int, default=None, help="Maximo de recortes para calibrar")
+    parser.add_argument("--eval-limit", type=int, default=None, help="Maximo de recortes para comparar")
+    parser.add_argument("--min-agreement", type=float, default=0.98, help="Coincidencia top-1 minima aceptada")
+    parser.add_argument("--max-deviation", type=float, default=0.02, help="Desviacion media maxima por clase (probabilidad)")
+    parser.add_argument("--threads", type=int, default=0, help="Hilos de inferencia")
+    parser.add_argument("-o", "--output", default=None, help="Guardar el informe en JSON")
+    args = parser.parse_args()
+
+    try:
+        float_path = args.float_path
+        int8_path = args.int8_path
+        if float_path is None and int8_path is None:
+            from model_cache import ModelCache
+            cache = ModelCache()
+            float_path = cache.ensure(EmotionConfig(backend="onnxruntime"))
+            int8_path = cache.ensure(EmotionConfig(
+                backend="onnxruntime",
+                quantize="static",
+                calibration_dir=args.calibration,
+                calibration_method=args.method,
+                calibration_limit=args.calibration_limit
+            ))
+        else:
+            if float_path is None:
+                from model_cache import ModelCache
+                float_path = ModelCache().ensure(EmotionConfig(backend="onnxruntime"))
+            if int8_path is None:
+                int8_path = os.path.splitext(float_path)[0] + "_int8.onnx"
+            started = time.perf_counter()
+            quantize_static_model(float_path, int8_path, args.calibration, args.calibration_limit, args.method)
+            print(f"[INFO] Modelo INT8 generado en {time.perf_counter() - started:.1f}s: {int8_path}")
+
+        report = compare_models(
+            float_path,
+            int8_path,
+            args.eval,
+            limit=args.eval_limit,
+            min_agreement=args.min_agreement,
+            max_deviation=args.max_deviation,
+            num_threads=args.threads
+        )
+    except (ImportError, ValueError, OSError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"float_path": float_path, "int8_path": int8_path, **asdict(report)}, f, indent=2)
+        print(f"[INFO] Informe guardado en {args.output}")
+
+    for failure in report.failures:
+        print(f"[REGRESION] {failure}")
+    if not report.passed:
+        sys.exit(1)
+    print("[INFO] El modelo INT8 esta dentro de la tolerancia")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -11,20 +11,95 @@ class FaceDetector(BaseDetector):
         self._cascade = cv2.CascadeClassifier(
             cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
         )
-        
+        self._last_bbox: Optional[Tuple[int, int, int, int]] = None
+        self._roi_misses = 0
+
     def detect(self, image: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if not self._config.roi_search:
+            return self._full_scan(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), scale=1.0)
+
+        if self._last_bbox is not None and self._roi_misses < self._config.roi_max_misses:
+            bbox = self._roi_scan(image, self._last_bbox)
+            if bbox is None:
+                self._roi_misses += 1
+                return None
+        else:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            width = gray.shape[1]
+            scale = min(1.0, self._config.full_scan_max_width / width) if width > 0 else 1.0
+            bbox = self._full_scan(gray, scale)
+
+        self._last_bbox = bbox
+        self._roi_misses = 0
+        return bbox
+
+    def _full_scan(self, gray: np.ndarray, scale: float) -> Optional[Tuple[int, int, int, int]]:
+        min_size = self._config.min_face_size
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            min_size = (int(min_size[0] * scale), int(min_size[1] * scale))
+
         faces = self._cascade.detectMultiScale(
             gray,
             scaleFactor=self._config.scale_factor,
             minNeighbors=self._config.min_neighbors,
-            minSize=self._config.min_face_size
+            minSize=min_size
+        )
+        if len(faces) == 0:
+            return None
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        if scale < 1.0:
+            return int(x / scale), int(y / scale), int(w / scale), int(h / scale)
+        return int(x), int(y), int(w), int(h)
+
+    def _roi_scan(
+        self,
+        image: np.ndarray,
+        last_bbox: Tuple[int, int, int, int]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        x, y, w, h = last_bbox
+        margin_x = int(w * self._config.roi_expansion)
+        margin_y = int(h * self._config.roi_expansion)
+        x1 = max(0, x - margin_x)
+        y1 = max(0, y - margin_y)
+        x2 = min(image.shape[1], x + w + margin_x)
+        y2 = min(image.shape[0], y + h + margin_y)
+        if x2 <= x1 or y2 <= y1:
+            return None
+
+        roi = cv2.cvtColor(image[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, self._config.roi_target_face_size / max(w, h))
+        if scale < 1.0:
+            roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        tolerance = self._config.roi_size_tolerance
+        min_size = (int(w * scale * (1 - tolerance)), int(h * scale * (1 - tolerance)))
+        max_size = (int(w * scale * (1 + tolerance)) + 1, int(h * scale * (1 + tolerance)) + 1)
+
+        faces = self._cascade.detectMultiScale(
+            roi,
+            scaleFactor=self._config.scale_factor,
+            minNeighbors=self._config.min_neighbors,
+            minSize=min_size,
+            maxSize=max_size
         )
         if len(faces) == 0:
             return None
-        largest = max(faces, key=lambda f: f[2] * f[3])
-        return tuple(largest)
-    
+        fx, fy, fw, fh = max(faces, key=lambda f: f[2] * f[3])
+        return (
+            x1 + int(fx / scale),
+            y1 + int(fy / scale),
+            int(fw / scale),
+            int(fh / scale)
+        )
+
+    def warm_up(self, size: Tuple[int, int] = (640, 480)):
+        self._cascade.detectMultiScale(np.zeros((size[1], size[0]), dtype=np.uint8))
+
+    def reset(self):
+        self._last_bbox = None
+        self._roi_misses = 0
+
     def crop_face(self, image: np.ndarray, bbox: Tuple[int, int, int, int]) -> np.ndarray:
         x, y, w, h = bbox
         padding = int(self._config.face_padding * min(w, h))
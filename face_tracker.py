@@ -0,0 +1,72 @@
+import numpy as np
+from typing import Optional, Tuple
+from config import DetectorConfig
+from landmark_extractor import FaceLandmarks
+
+
+class LandmarkFaceTracker:
+    def __init__(self, config: DetectorConfig = None):
+        self._config = config or DetectorConfig()
+        self._is_tracking = False
+        self._tracked_frames = 0
+        self._lost_count = 0
+
+    def update(
+        self,
+        landmarks: Optional[FaceLandmarks],
+        image_shape: Tuple[int, ...]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        bbox = None
+        if landmarks is not None:
+            bbox = self._bbox_from_landmarks(landmarks, image_shape)
+
+        if bbox is None:
+            if self._is_tracking:
+                self._lost_count += 1
+            self._is_tracking = False
+            return None
+
+        self._is_tracking = True
+        self._tracked_frames += 1
+        return bbox
+
+    def _bbox_from_landmarks(
+        self,
+        landmarks: FaceLandmarks,
+        image_shape: Tuple[int, ...]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        height, width = image_shape[:2]
+        points = landmarks.points[:FaceLandmarks.MESH_SIZE]
+
+        inside = (
+            (points[:, 0] >= 0) & (points[:, 0] < width) &
+            (points[:, 1] >= 0) & (points[:, 1] < height)
+        )
+        if inside.mean() < self._config.tracking_min_visibility:
+            return None
+
+        x1, y1 = np.maximum(points.min(axis=0), 0)
+        x2, y2 = np.minimum(points.max(axis=0), (width - 1, height - 1))
+        w = int(x2 - x1)
+        h = int(y2 - y1)
+
+        min_w, min_h = self._config.min_face_size
+        if w < min_w * self._config.tracking_min_size_ratio or h < min_h * self._config.tracking_min_size_ratio:
+            return None
+
+        return int(x1), int(y1), w, h
+
+    def reset(self):
+        self._is_tracking = False
+
+    @property
+    def is_tracking(self) -> bool:
+        return self._is_tracking
+
+    @property
+    def tracked_frames(self) -> int:
+        return self._tracked_frames
+
+    @property
+    def lost_count(self) -> int:
+        return self._lost_count
\ No newline at end of file
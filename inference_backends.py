@@ -0,0 +1,286 @@
+import os
+import cv2
+import numpy as np
+from dataclasses import replace
+from typing import List
+from interfaces import BaseInferenceBackend
+from config import EmotionConfig
+
+
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+DEFAULT_MODEL_PATHS = {
+    "torchscript": "emotion_model.pt",
+    "onnxruntime": "model_float32.onnx",
+    "tflite": "emotion_model.tflite"
+}
+
+CACHED_BACKENDS = {
+    "torch": "torchscript",
+    "torchscript": "torchscript",
+    "onnxruntime": "onnxruntime",
+    "tflite": "tflite"
+}
+
+
+def model_input_size(model_name: str) -> int:
+    return 224 if "_b0_" in model_name else 260
+
+
+def check_output_width(width, model_path: str):
+    from emotion_classifier import EmotionClassifier
+
+    expected = len(EmotionClassifier.EMOTION_LABELS)
+    if isinstance(width, (int, np.integer)) and width != expected:
+        raise ValueError(
+            f"El modelo {model_path} produce {width} salidas en lugar de {expected} emociones; "
+            f"exporta el modelo con el clasificador (python model_cache.py o export_onnx.py)"
+        )
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    e_x = np.exp(logits - np.max(logits))
+    return e_x / e_x.sum()
+
+
+class FacePreprocessor:
+    def __init__(self, size: int, channels_last: bool, batch_size: int = 1, swap_rb: bool = False):
+        self._size = size
+        self._channels_last = channels_last
+        self._swap_rb = swap_rb
+        self._order = (2, 1, 0) if swap_rb else (0, 1, 2)
+        scale = 1.0 / (255.0 * IMAGENET_STD)
+        offset = -IMAGENET_MEAN / IMAGENET_STD
+        self._scale = [float(v) for v in scale]
+        self._offset = [float(v) for v in offset]
+        self._scale_scalar = tuple(self._scale) + (0.0,)
+        self._offset_scalar = tuple(self._offset) + (0.0,)
+        self._resized = np.empty((size, size, 3), dtype=np.uint8)
+        self._swapped = np.empty_like(self._resized) if swap_rb else None
+        self._planes = [np.empty((size, size), dtype=np.uint8) for _ in range(3)]
+        self._tensor = self._allocate(max(1, batch_size))
+
+    def _allocate(self, batch_size: int) -> np.ndarray:
+        shape = (self._size, self._size, 3) if self._channels_last else (3, self._size, self._size)
+        return np.empty((batch_size,) + shape, dtype=np.float32)
+
+    def _resize(self, face_crop: np.ndarray):
+        interpolation = cv2.INTER_AREA if min(face_crop.shape[:2]) > self._size else cv2.INTER_LINEAR
+        cv2.resize(face_crop, (self._size, self._size), dst=self._resized, interpolation=interpolation)
+
+    def fill(self, face_crop: np.ndarray, sample: np.ndarray) -> np.ndarray:
+        self._resize(face_crop)
+        if self._channels_last:
+            source = self._resized
+            if self._swap_rb:
+                cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._swapped)
+                source = self._swapped
+            cv2.multiply(source, self._scale_scalar, dst=sample, dtype=cv2.CV_32F)
+            cv2.add(sample, self._offset_scalar, dst=sample)
+        else:
+            cv2.split(self._resized, self._planes)
+            for c, source in enumerate(self._order):
+                plane = self._planes[source]
+                cv2.addWeighted(plane, self._scale[c], plane, 0.0, self._offset[c], dst=sample[c], dtype=cv2.CV_32F)
+        return sample
+
+    def __call__(self, face_crop: np.ndarray) -> np.ndarray:
+        self.fill(face_crop, self._tensor[0])
+        return self._tensor[:1]
+
+    def batch(self, face_crops: List[np.ndarray]) -> np.ndarray:
+        if len(face_crops) > len(self._tensor):
+            self._tensor = self._allocate(len(face_crops))
+        for i, face_crop in enumerate(face_crops):
+            self.fill(face_crop, self._tensor[i])
+        return self._tensor[:len(face_crops)]
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def channels_last(self) -> bool:
+        return self._channels_last
+
+    @property
+    def tensor(self) -> np.ndarray:
+        return self._tensor
+
+
+class TorchEmotionBackend(BaseInferenceBackend):
+    def __init__(self, config: EmotionConfig):
+        import torch
+        from hsemotion.facial_emotions import HSEmotionRecognizer
+
+        if config.num_threads > 0:
+            torch.set_num_threads(config.num_threads)
+        self._recognizer = HSEmotionRecognizer(
+            model_name=config.model_name,
+            device=config.device
+        )
+        self._torch = torch
+        self._device = torch.device(config.device)
+        self._preprocessor = FacePreprocessor(
+            getattr(self._recognizer, "img_size", model_input_size(config.model_name)),
+            channels_last=False,
+            batch_size=config.max_batch_size
+        )
+        self._weights_t = np.ascontiguousarray(self._recognizer.classifier_weights.T)
+        self._bias = self._recognizer.classifier_bias
+        self._is_mtl = getattr(self._recognizer, "is_mtl", False)
+
+    def _run(self, tensor: np.ndarray) -> np.ndarray:
+        with self._torch.inference_mode():
+            features = self._recognizer.model(self._torch.from_numpy(tensor).to(self._device))
+        logits = features.cpu().numpy() @ self._weights_t + self._bias
+        return logits[:, :-2] if self._is_mtl else logits
+
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        return softmax(self._run(self._preprocessor(face_crop))[0])
+
+    def predict_batch(self, face_crops: List[np.ndarray]) -> np.ndarray:
+        logits = self._run(self._preprocessor.batch(face_crops))
+        return np.stack([softmax(row) for row in logits])
+
+
+class TorchScriptEmotionBackend(BaseInferenceBackend):
+    def __init__(self, config: EmotionConfig):
+        import torch
+
+        if config.num_threads > 0:
+            torch.set_num_threads(config.num_threads)
+        model_path = config.model_path or DEFAULT_MODEL_PATHS["torchscript"]
+        self._torch = torch
+        self._device = torch.device(config.device)
+        self._model = torch.jit.load(model_path, map_location=self._device).eval()
+        self._preprocessor = FacePreprocessor(
+            model_input_size(config.model_name),
+            channels_last=False,
+            batch_size=config.max_batch_size
+        )
+
+    def _run(self, tensor: np.ndarray) -> np.ndarray:
+        with self._torch.inference_mode():
+            logits = self._model(self._torch.from_numpy(tensor).to(self._device))
+        return logits.cpu().numpy()
+
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        return softmax(self._run(self._preprocessor(face_crop))[0])
+
+    def predict_batch(self, face_crops: List[np.ndarray]) -> np.ndarray:
+        return np.stack([softmax(row) for row in self._run(self._preprocessor.batch(face_crops))])
+
+
+class OnnxEmotionBackend(BaseInferenceBackend):
+    def __init__(self, config: EmotionConfig):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if config.num_threads > 0:
+            options.intra_op_num_threads = config.num_threads
+            options.inter_op_num_threads = 1
+
+        model_path = config.model_path or DEFAULT_MODEL_PATHS["onnxruntime"]
+        self._session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        check_output_width(self._session.get_outputs()[0].shape[-1], model_path)
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._dynamic_batch = not isinstance(model_input.shape[0], int)
+        self._channels_last = model_input.shape[-1] == 3
+        self._input_size = model_input.shape[1] if self._channels_last else model_input.shape[2]
+        if not isinstance(self._input_size, int):
+            self._input_size = 224
+        self._preprocessor = FacePreprocessor(
+            self._input_size,
+            self._channels_last,
+            batch_size=config.max_batch_size if self._dynamic_batch else 1
+        )
+
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        logits = self._session.run(None, {self._input_name: self._preprocessor(face_crop)})[0][0]
+        return softmax(logits)
+
+    def predict_batch(self, face_crops: List[np.ndarray]) -> np.ndarray:
+        if not self._dynamic_batch:
+            return super().predict_batch(face_crops)
+        logits = self._session.run(None, {self._input_name: self._preprocessor.batch(face_crops)})[0]
+        return np.stack([softmax(row) for row in logits])
+
+
+class TFLiteEmotionBackend(BaseInferenceBackend):
+    def __init__(self, config: EmotionConfig):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        model_path = config.model_path or DEFAULT_MODEL_PATHS["tflite"]
+        self._interpreter = Interpreter(
+            model_path=model_path,
+            num_threads=config.num_threads if config.num_threads > 0 else None
+        )
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        check_output_width(self._output["shape"][-1], model_path)
+        shape = self._input["shape"]
+        self._channels_last = shape[-1] == 3
+        self._input_size = int(shape[1] if self._channels_last else shape[2])
+        self._preprocessor = FacePreprocessor(self._input_size, self._channels_last)
+        self._zero_copy = self._input["dtype"] == np.float32
+
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        if self._zero_copy:
+            input_tensor = self._interpreter.tensor(self._input["index"])()
+            self._preprocessor.fill(face_crop, input_tensor[0])
+            del input_tensor
+        else:
+            self._interpreter.set_tensor(self._input["index"], self._preprocessor(face_crop))
+        self._interpreter.invoke()
+        logits = self._interpreter.get_tensor(self._output["index"])[0]
+        return softmax(logits)
+
+
+class StubEmotionBackend(BaseInferenceBackend):
+    LOGITS = np.array([0.1, -1.0, -0.5, -0.2, 1.0, 2.0, 0.0, -0.3], dtype=np.float32)
+
+    def __init__(self, config: EmotionConfig):
+        self._preprocessor = FacePreprocessor(224, channels_last=False)
+
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        self._preprocessor(face_crop)
+        return softmax(self.LOGITS)
+
+
+BACKENDS = {
+    "torch": TorchEmotionBackend,
+    "torchscript": TorchScriptEmotionBackend,
+    "onnxruntime": OnnxEmotionBackend,
+    "tflite": TFLiteEmotionBackend,
+    "stub": StubEmotionBackend
+}
+
+
+def create_emotion_backend(config: EmotionConfig = None) -> BaseInferenceBackend:
+    config = config or EmotionConfig()
+    if config.model_cache and config.model_path is None and config.backend in CACHED_BACKENDS:
+        from model_cache import ModelCache
+
+        config = replace(config, backend=CACHED_BACKENDS[config.backend])
+        config = replace(config, model_path=ModelCache(config.cache_dir).ensure(config))
+    backend_class = BACKENDS.get(config.backend)
+    if backend_class is None:
+        raise ValueError(f"Backend de inferencia desconocido: {config.backend}")
+    if config.backend in DEFAULT_MODEL_PATHS:
+        model_path = config.model_path or DEFAULT_MODEL_PATHS[config.backend]
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"No se encontro el modelo: {model_path}")
+    return backend_class(config)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Optional, List
 import numpy as np
 
 
@@ -18,4 +18,16 @@ class BaseClassifier(ABC):
 class BaseAnalyzer(ABC):
     @abstractmethod
     def analyze(self, data: Any) -> Any:
-        pass
\ No newline at end of file
+        pass
+
+
+class BaseInferenceBackend(ABC):
+    @abstractmethod
+    def predict_scores(self, face_crop: np.ndarray) -> np.ndarray:
+        pass
+
+    def predict_batch(self, face_crops: List[np.ndarray]) -> np.ndarray:
+        return np.stack([self.predict_scores(crop) for crop in face_crops])
+
+    def warm_up(self, size: int = 224):
+        self.predict_scores(np.zeros((size, size, 3), dtype=np.uint8))
\ No newline at end of file
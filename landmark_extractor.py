@@ -1,30 +1,80 @@
 import cv2
 import numpy as np
 import mediapipe as mp
-from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Optional, Tuple
+from dataclasses import dataclass, field
 
 
 @dataclass
 class FaceLandmarks:
-    left_eye: List[Tuple[float, float]]
-    right_eye: List[Tuple[float, float]]
-    mouth: List[Tuple[float, float]]
-    nose_tip: Tuple[float, float]
-    chin: Tuple[float, float]
-    left_eye_outer: Tuple[float, float]
-    right_eye_outer: Tuple[float, float]
-    all_landmarks: List[Tuple[float, float, float]]
-
-
-class LandmarkExtractor:
-    LEFT_EYE_INDICES = [362, 385, 387, 263, 373, 380]
-    RIGHT_EYE_INDICES = [33, 160, 158, 133, 153, 144]
-    MOUTH_INDICES = [61, 291, 0, 17, 405, 321, 375, 78, 191, 80, 81, 82]
+    LEFT_EYE_INDICES = np.array([362, 385, 387, 263, 373, 380])
+    RIGHT_EYE_INDICES = np.array([33, 160, 158, 133, 153, 144])
+    MOUTH_INDICES = np.array([61, 291, 0, 17, 405, 321, 375, 78, 191, 80, 81, 82])
     NOSE_TIP_INDEX = 1
     CHIN_INDEX = 152
     LEFT_EYE_OUTER_INDEX = 263
     RIGHT_EYE_OUTER_INDEX = 33
+    MESH_SIZE = 468
+    REFINED_MESH_SIZE = 478
+    ANALYSIS_INDICES = np.unique(np.concatenate([
+        LEFT_EYE_INDICES, RIGHT_EYE_INDICES, MOUTH_INDICES,
+        [NOSE_TIP_INDEX, CHIN_INDEX, LEFT_EYE_OUTER_INDEX, RIGHT_EYE_OUTER_INDEX]
+    ]))
+
+    normalized: np.ndarray
+    width: int
+    height: int
+    points: np.ndarray = field(init=False, repr=False)
+    _points_3d: Optional[np.ndarray] = field(init=False, default=None, repr=False)
+
+    def __post_init__(self):
+        self.points = self.normalized[:, :2] * np.array((self.width, self.height), dtype=np.float32)
+
+    @property
+    def left_eye(self) -> np.ndarray:
+        return self.points[self.LEFT_EYE_INDICES]
+
+    @property
+    def right_eye(self) -> np.ndarray:
+        return self.points[self.RIGHT_EYE_INDICES]
+
+    @property
+    def mouth(self) -> np.ndarray:
+        return self.points[self.MOUTH_INDICES]
+
+    @property
+    def nose_tip(self) -> np.ndarray:
+        return self.points[self.NOSE_TIP_INDEX]
+
+    @property
+    def chin(self) -> np.ndarray:
+        return self.points[self.CHIN_INDEX]
+
+    @property
+    def left_eye_outer(self) -> np.ndarray:
+        return self.points[self.LEFT_EYE_OUTER_INDEX]
+
+    @property
+    def right_eye_outer(self) -> np.ndarray:
+        return self.points[self.RIGHT_EYE_OUTER_INDEX]
+
+    @property
+    def all_landmarks(self) -> np.ndarray:
+        if self._points_3d is None:
+            self._points_3d = self.normalized[:self.MESH_SIZE] * np.array(
+                (self.width, self.height, self.width), dtype=np.float32
+            )
+        return self._points_3d
+
+
+class LandmarkExtractor:
+    LEFT_EYE_INDICES = FaceLandmarks.LEFT_EYE_INDICES.tolist()
+    RIGHT_EYE_INDICES = FaceLandmarks.RIGHT_EYE_INDICES.tolist()
+    MOUTH_INDICES = FaceLandmarks.MOUTH_INDICES.tolist()
+    NOSE_TIP_INDEX = FaceLandmarks.NOSE_TIP_INDEX
+    CHIN_INDEX = FaceLandmarks.CHIN_INDEX
+    LEFT_EYE_OUTER_INDEX = FaceLandmarks.LEFT_EYE_OUTER_INDEX
+    RIGHT_EYE_OUTER_INDEX = FaceLandmarks.RIGHT_EYE_OUTER_INDEX
 
     def __init__(self):
         self._face_mesh = mp.solutions.face_mesh.FaceMesh(
@@ -38,37 +88,23 @@ class LandmarkExtractor:
     def extract(self, image: np.ndarray) -> Optional[FaceLandmarks]:
         rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         results = self._face_mesh.process(rgb_image)
-        
+
         if not results.multi_face_landmarks:
             return None
-            
-        face_landmarks = results.multi_face_landmarks[0]
+
+        landmark_list = results.multi_face_landmarks[0].landmark
         h, w = image.shape[:2]
-        
-        def get_point(idx: int) -> Tuple[float, float]:
-            lm = face_landmarks.landmark[idx]
-            return (lm.x * w, lm.y * h)
-        
-        def get_point_3d(idx: int) -> Tuple[float, float, float]:
-            lm = face_landmarks.landmark[idx]
-            return (lm.x * w, lm.y * h, lm.z * w)
-        
-        left_eye = [get_point(i) for i in self.LEFT_EYE_INDICES]
-        right_eye = [get_point(i) for i in self.RIGHT_EYE_INDICES]
-        mouth = [get_point(i) for i in self.MOUTH_INDICES]
-        
-        all_landmarks = [get_point_3d(i) for i in range(468)]
-        
-        return FaceLandmarks(
-            left_eye=left_eye,
-            right_eye=right_eye,
-            mouth=mouth,
-            nose_tip=get_point(self.NOSE_TIP_INDEX),
-            chin=get_point(self.CHIN_INDEX),
-            left_eye_outer=get_point(self.LEFT_EYE_OUTER_INDEX),
-            right_eye_outer=get_point(self.RIGHT_EYE_OUTER_INDEX),
-            all_landmarks=all_landmarks
-        )
+
+        normalized = np.fromiter(
+            (value for lm in landmark_list for value in (lm.x, lm.y, lm.z)),
+            dtype=np.float32,
+            count=3 * len(landmark_list)
+        ).reshape(-1, 3)
+
+        return FaceLandmarks(normalized=normalized, width=w, height=h)
+
+    def warm_up(self, size: Tuple[int, int] = (640, 480)):
+        self._face_mesh.process(np.zeros((size[1], size[0], 3), dtype=np.uint8))
 
     def release(self):
         self._face_mesh.close()
\ No newline at end of file
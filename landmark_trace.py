@@ -0,0 +1,254 @@
+import time
+import argparse
+import numpy as np
+from typing import Dict, Iterator, List, Optional
+from config import AppConfig
+from analysis_pipeline import FrameTask
+from landmark_extractor import FaceLandmarks
+from drowsiness_analyzer import DrowsinessAnalyzer, DrowsinessResult, eye_aspect_ratio, mouth_aspect_ratio
+from attention_analyzer import AttentionAnalyzer
+from emotion_classifier import EmotionClassifier
+from inference_backends import StubEmotionBackend
+from state_aggregator import StateAggregator, CombinedState
+from state_timeline import StateTimeline
+
+
+FLAG_FACE = 1
+FLAG_LANDMARKS = 2
+FLAG_DROWSINESS = 4
+FLAG_ATTENTION = 8
+FLAG_EMOTION = 16
+FLAG_RESET = 32
+FLAG_CALIBRATION_RESET = 64
+
+
+class LandmarkTraceRecorder:
+    def __init__(
+        self,
+        full_mesh: bool = False,
+        num_points: int = FaceLandmarks.REFINED_MESH_SIZE,
+        capacity: int = 1024
+    ):
+        self._num_points = num_points
+        self._indices = np.arange(num_points) if full_mesh else FaceLandmarks.ANALYSIS_INDICES
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._pending_flags = 0
+        self._columns = {
+            "sequence": np.zeros(self._capacity, dtype=np.int64),
+            "timestamp": np.zeros(self._capacity, dtype=np.float64),
+            "flags": np.zeros(self._capacity, dtype=np.uint8),
+            "bbox": np.zeros((self._capacity, 4), dtype=np.int32),
+            "image_size": np.zeros((self._capacity, 2), dtype=np.int32),
+            "landmarks": np.zeros((self._capacity, len(self._indices), 3), dtype=np.float32),
+            "emotion_scores": np.zeros((self._capacity, len(EmotionClassifier.EMOTION_LABELS)), dtype=np.float32)
+        }
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros((self._capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def mark_reset(self):
+        self._pending_flags |= FLAG_RESET
+
+    def mark_calibration_reset(self):
+        self._pending_flags |= FLAG_CALIBRATION_RESET
+
+    def record(self, task: FrameTask, timestamp: Optional[float] = None):
+        if self._size == self._capacity:
+            self._grow()
+
+        i = self._size
+        columns = self._columns
+        flags = self._pending_flags
+        self._pending_flags = 0
+
+        columns["sequence"][i] = task.sequence
+        columns["timestamp"][i] = time.time() if timestamp is None else timestamp
+        if task.bbox is not None:
+            flags |= FLAG_FACE
+            columns["bbox"][i] = task.bbox
+        if task.landmarks is not None:
+            flags |= FLAG_LANDMARKS
+            columns["landmarks"][i] = task.landmarks.normalized[self._indices]
+            columns["image_size"][i] = (task.landmarks.width, task.landmarks.height)
+        if "drowsiness" in task.timings:
+            flags |= FLAG_DROWSINESS
+        if "attention" in task.timings:
+            flags |= FLAG_ATTENTION
+        if task.raw_scores is not None:
+            flags |= FLAG_EMOTION
+            columns["emotion_scores"][i] = task.raw_scores
+        columns["flags"][i] = flags
+        self._size += 1
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {name: column[:self._size] for name, column in self._columns.items()}
+        arrays["landmark_indices"] = self._indices
+        arrays["num_points"] = np.array(self._num_points)
+        return arrays
+
+    def save(self, path: str):
+        np.savez_compressed(path, **self.to_arrays())
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def load_trace(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+class TraceReplay:
+    def __init__(self, trace: Dict[str, np.ndarray], config: AppConfig = None):
+        self._trace = trace
+        self._config = config or AppConfig()
+        self._backend = StubEmotionBackend(self._config.emotion)
+        self._rebuild_analyzers()
+        self._mesh = np.zeros((int(trace["num_points"]), 3), dtype=np.float32)
+        self._indices = trace["landmark_indices"]
+
+    def _rebuild_analyzers(self):
+        self._drowsiness_analyzer = DrowsinessAnalyzer(self._config.drowsiness)
+        self._attention_analyzer = AttentionAnalyzer(self._config.attention)
+        self._emotion_classifier = EmotionClassifier(self._config.emotion, self._backend)
+        self._state_aggregator = StateAggregator()
+
+    def __len__(self) -> int:
+        return len(self._trace["flags"])
+
+    def landmarks(self, i: int) -> FaceLandmarks:
+        mesh = self._mesh.copy()
+        mesh[self._indices] = self._trace["landmarks"][i]
+        width, height = self._trace["image_size"][i]
+        return FaceLandmarks(normalized=mesh, width=int(width), height=int(height))
+
+    def _drowsiness_results(self) -> List[Optional[DrowsinessResult]]:
+        flags = self._trace["flags"]
+        required = FLAG_FACE | FLAG_LANDMARKS | FLAG_DROWSINESS
+        selected = np.flatnonzero((flags & required) == required)
+        results: List[Optional[DrowsinessResult]] = [None] * len(flags)
+        if selected.size == 0:
+            return results
+
+        eye_positions = np.searchsorted(self._indices, DrowsinessAnalyzer.EYE_INDICES)
+        mouth_positions = np.searchsorted(self._indices, DrowsinessAnalyzer.MOUTH_INDICES)
+        sizes = self._trace["image_size"][selected].astype(np.float32)
+        points = self._trace["landmarks"][selected][:, :, :2] * sizes[:, None, :]
+        ear = eye_aspect_ratio(points[:, eye_positions]).mean(axis=1)
+        mar = mouth_aspect_ratio(points[:, mouth_positions])
+
+        segments = np.cumsum((flags & FLAG_RESET) != 0)[selected]
+        changes = np.flatnonzero(np.diff(segments)) + 1
+        bounds = np.concatenate([[0], changes, [selected.size]])
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if start > 0:
+                self._drowsiness_analyzer.reset()
+            sequence = self._drowsiness_analyzer.analyze_metrics(ear[start:end], mar[start:end])
+            for j in range(end - start):
+                results[selected[start + j]] = DrowsinessResult(
+                    ear=float(sequence.ear[j]),
+                    mar=float(sequence.mar[j]),
+                    is_drowsy=bool(sequence.is_drowsy[j]),
+                    is_yawning=bool(sequence.is_yawning[j]),
+                    drowsy_frames=int(sequence.drowsy_frames[j]),
+                    yawn_frames=int(sequence.yawn_frames[j])
+                )
+        return results
+
+    def __iter__(self) -> Iterator[CombinedState]:
+        self._rebuild_analyzers()
+        flags = self._trace["flags"]
+        scores = self._trace["emotion_scores"]
+        drowsiness_results = self._drowsiness_results()
+        last_drowsiness = None
+        last_attention = None
+        last_emotion = None
+
+        for i in range(len(flags)):
+            flag = int(flags[i])
+            if flag & FLAG_RESET:
+                self._attention_analyzer.reset()
+                self._emotion_classifier.reset()
+                last_drowsiness = last_attention = last_emotion = None
+            if flag & FLAG_CALIBRATION_RESET:
+                self._attention_analyzer.reset_calibration()
+
+            if not flag & FLAG_FACE:
+                yield self._state_aggregator.aggregate(face_detected=False)
+                continue
+
+            drowsiness = attention = None
+            calibrating = False
+            cognitive_state, confidence, emotion, emotion_scores = "desconocido", 0.0, "Unknown", {}
+
+            if flag & FLAG_LANDMARKS:
+                if flag & FLAG_DROWSINESS:
+                    last_drowsiness = drowsiness_results[i]
+                if flag & FLAG_ATTENTION:
+                    last_attention = self._attention_analyzer.analyze(self.landmarks(i))
+                drowsiness = last_drowsiness
+                attention = last_attention
+                calibrating = not self._attention_analyzer.is_calibrated
+
+                if flag & FLAG_EMOTION:
+                    last_emotion = self._emotion_classifier.classify_scores(scores[i])
+                if last_emotion is not None:
+                    cognitive_state, confidence, emotion, emotion_scores = last_emotion
+
+            yield self._state_aggregator.aggregate(
+                face_detected=True,
+                cognitive_state=cognitive_state,
+                emotion=emotion,
+                confidence=confidence,
+                emotion_scores=emotion_scores,
+                drowsiness=drowsiness,
+                attention=attention,
+                calibrating=calibrating
+            )
+
+    def run(self) -> List[CombinedState]:
+        return list(self)
+
+    def to_timeline(self) -> Dict[str, np.ndarray]:
+        timeline = StateTimeline(capacity=len(self))
+        for i, state in enumerate(self):
+            timeline.append(state, int(self._trace["sequence"][i]), float(self._trace["timestamp"][i]))
+        return timeline.to_columns()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una traza de landmarks a traves de los analizadores")
+    parser.add_argument("trace", help="Archivo .npz generado con --trace")
+    parser.add_argument("-o", "--output", default=None, help="Guardar la linea de tiempo resultante (.npz)")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace)
+    replay = TraceReplay(trace)
+    started = time.perf_counter()
+    columns = replay.to_timeline()
+    elapsed = time.perf_counter() - started
+
+    frames = len(replay)
+    timestamps = trace["timestamp"]
+    duration = float(timestamps[-1] - timestamps[0]) if frames > 1 else 0.0
+    print(f"[INFO] {frames} frames reproducidos en {elapsed:.3f}s ({frames / elapsed if elapsed > 0 else 0:.0f} fps)")
+    if duration > 0 and elapsed > 0:
+        print(f"[INFO] {duration / elapsed:.0f}x mas rapido que la sesion original ({duration:.1f}s)")
+
+    counts = np.bincount(columns["final_state"], minlength=len(StateTimeline.FINAL_STATES))
+    for name, count in zip(StateTimeline.FINAL_STATES, counts):
+        if count:
+            print(f"  {name:<12} {count:>8} frames")
+
+    if args.output:
+        StateTimeline.save(args.output, columns)
+        print(f"[INFO] Linea de tiempo guardada en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,10 +1,17 @@
+import sys
 import cv2
+import time
+import argparse
 import logging
 from datetime import datetime
 from config import AppConfig
-from video_capture import VideoCapture
+from video_capture import create_capture, parse_source
 from analysis_pipeline import AnalysisPipeline
+from pipelined_executor import PipelinedExecutor
 from display_renderer import DisplayRenderer
+from state_stream import StateStreamWriter
+from state_journal import StateJournalWriter
+from landmark_trace import LandmarkTraceRecorder
 
 
 logging.basicConfig(
@@ -18,26 +25,60 @@ logger = logging.getLogger("APP")
 class Application:
     def __init__(self, config: AppConfig = None):
         self._config = config or AppConfig()
-        self._capture = VideoCapture()
+        self._started_at = time.perf_counter()
+        self._first_frame_at = None
+        self._startup_reported = False
         self._pipeline = AnalysisPipeline(self._config)
-        self._renderer = DisplayRenderer(self._config.display)
+        self._executor = None
+        if self._config.pipelined:
+            self._executor = PipelinedExecutor(self._pipeline, self._config.pipeline_queue_size)
+            self._config.capture.shared_pinned_frames = max(
+                self._config.capture.shared_pinned_frames,
+                self._executor.max_frames_in_flight + 1
+            )
+        self._capture = create_capture(self._config.capture.source, self._config.capture)
+        self._headless = self._config.output.headless
+        self._renderer = None if self._headless else DisplayRenderer(self._config.display)
+        self._journal = None
+        if self._config.output.journal_path:
+            self._journal = StateJournalWriter(self._config.output.journal_path, self._config.output.journal_batch_size)
+        self._journaled_state = None
+        if self._config.output.trace_path:
+            self._pipeline.attach_recorder(LandmarkTraceRecorder())
         self._frame_count = 0
         self._running = False
 
+    def _print(self, message: str):
+        print(message, file=sys.stderr if self._headless else sys.stdout)
+
     def run(self):
-        print("=" * 60)
-        print("SISTEMA DE ANALISIS DE EMOCIONES Y ATENCION")
-        print("HSEmotion + MediaPipe")
-        print("=" * 60)
-        print("[INFO] Inicializando componentes...")
+        self._print("=" * 60)
+        self._print("SISTEMA DE ANALISIS DE EMOCIONES Y ATENCION")
+        self._print("HSEmotion + MediaPipe")
+        self._print("=" * 60)
+        self._print("[INFO] Inicializando componentes...")
         
         if not self._capture.open():
             logger.error("No se pudo acceder a la camara")
-            print("[ERROR] No se pudo acceder a la camara")
+            self._print("[ERROR] No se pudo acceder a la camara")
             return
         
         width, height = self._capture.frame_size
         self._pipeline.update_image_size(width, height)
+        if self._pipeline.metrics:
+            self._pipeline.metrics.start()
+        if self._executor:
+            self._executor.start()
+        if self._journal:
+            try:
+                self._journal.open()
+            except (OSError, ValueError) as e:
+                self._print(f"[ERROR] No se pudo abrir el diario de estados: {e}")
+                self._journal = None
+        
+        if self._headless:
+            self._run_headless()
+            return
         
         print("[INFO] Sistema iniciado")
         print("=" * 60)
@@ -45,6 +86,8 @@ class Application:
         print("  'q' - Salir")
         print("  'd' - Mostrar/ocultar detalles de emociones")
         print("  'r' - Recalibrar posicion de cabeza")
+        if self._pipeline.scheduler:
+            print("  's' - Mostrar cadencias del planificador")
         print("=" * 60)
         
         self._running = True
@@ -55,14 +98,26 @@ class Application:
             if not ret:
                 logger.error("Error al leer frame de la camara")
                 break
+            if self._first_frame_at is None:
+                self._first_frame_at = time.perf_counter()
+            
+            process_frame = (
+                self._config.scheduler.enabled or
+                self._frame_count % self._config.process_every_n_frames == 0
+            )
             
-            if self._frame_count % self._config.process_every_n_frames == 0:
+            if self._executor:
+                state, bbox = self._process_pipelined(frame, process_frame)
+            elif process_frame:
                 state, bbox = self._pipeline.process(frame)
             else:
+                self._pipeline.mark_skipped()
                 state = self._pipeline.last_state
                 bbox = self._pipeline.last_bbox
             
+            self._report_startup()
             if state:
+                self._record(state)
                 display = self._renderer.render(frame, state, bbox)
                 
                 if self._frame_count % 30 == 0 and state.face_detected:
@@ -81,23 +136,152 @@ class Application:
                 self._running = False
             elif key == ord("d"):
                 self._renderer.toggle_details()
-                print(f"[INFO] Detalles: {'activados' if self._renderer._show_details else 'desactivados'}")
+                print(f"[INFO] Detalles: {'activados' if self._renderer.show_details else 'desactivados'}")
             elif key == ord("r"):
                 self._pipeline.reset_calibration()
                 print("[INFO] Recalibrando... mire a la pantalla")
+            elif key == ord("s") and self._pipeline.scheduler:
+                scheduler = self._pipeline.scheduler
+                print(f"[INFO] Cadencias: {scheduler.cadences} | Costo estimado: {scheduler.expected_frame_cost_ms:.1f} ms")
         
         self._shutdown()
 
+    def _run_headless(self):
+        writer = StateStreamWriter(self._config.output.state_output, self._config.output.transitions_only)
+        try:
+            writer.open()
+        except OSError as e:
+            self._print(f"[ERROR] No se pudo abrir la salida de estados: {e}")
+            self._shutdown()
+            return
+        
+        self._print(f"[INFO] Sistema iniciado sin ventana, estados -> {self._config.output.state_output}")
+        self._running = True
+        
+        try:
+            while self._running:
+                captured = self._capture.read_frame()
+                if captured is None:
+                    logger.error("Error al leer frame de la camara")
+                    break
+                if self._first_frame_at is None:
+                    self._first_frame_at = time.perf_counter()
+                
+                process_frame = (
+                    self._config.scheduler.enabled or
+                    self._frame_count % self._config.process_every_n_frames == 0
+                )
+                
+                if self._executor:
+                    if process_frame:
+                        self._executor.submit(captured.frame, sequence=self._frame_count)
+                    else:
+                        self._pipeline.mark_skipped()
+                    while True:
+                        result = self._executor.get_result(block=False)
+                        if result is None:
+                            break
+                        writer.write(result.state, result.sequence, result.bbox)
+                        self._record(result.state)
+                elif process_frame:
+                    state, bbox = self._pipeline.process(captured.frame)
+                    writer.write(state, self._frame_count, bbox)
+                    self._record(state)
+                else:
+                    self._pipeline.mark_skipped()
+                
+                self._report_startup()
+                self._frame_count += 1
+            
+            while self._executor:
+                result = self._executor.get_result(timeout=1.0)
+                if result is None:
+                    break
+                writer.write(result.state, result.sequence, result.bbox)
+                self._record(result.state)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            writer.close()
+            self._print(f"[INFO] Estados emitidos: {writer.written}")
+            self._shutdown()
+
+    def _report_startup(self):
+        if self._startup_reported or not self._pipeline.is_ready:
+            return
+        self._startup_reported = True
+        loader = self._pipeline.loader
+        first_frame = (self._first_frame_at - self._started_at) * 1000 if self._first_frame_at else 0.0
+        self._print(
+            f"[INFO] Modelos listos en {loader.ready_seconds * 1000:.0f} ms "
+            f"(primer frame a los {first_frame:.0f} ms, "
+            f"analisis activo a los {(time.perf_counter() - self._started_at) * 1000:.0f} ms)"
+        )
+        for line in loader.report():
+            self._print(line)
+
+    def _record(self, state):
+        if self._journal and state is not self._journaled_state:
+            self._journal.append(state)
+            self._journaled_state = state
+
+    def _process_pipelined(self, frame, process_frame: bool):
+        if not process_frame or not self._executor.submit(frame, block=False):
+            self._pipeline.mark_skipped()
+        
+        latest = None
+        while True:
+            result = self._executor.get_result(block=False)
+            if result is None:
+                break
+            self._record(result.state)
+            latest = result
+        
+        if latest is None:
+            return self._pipeline.last_state, self._pipeline.last_bbox
+        return latest.state, latest.bbox
+
     def _shutdown(self):
-        print("[INFO] Cerrando sistema...")
+        self._print("[INFO] Cerrando sistema...")
+        if self._executor:
+            self._executor.stop()
         self._capture.release()
         self._pipeline.release()
-        cv2.destroyAllWindows()
-        print("[INFO] Sistema detenido")
+        gate = self._pipeline.emotion_gate
+        if gate is not None and gate.hits + gate.misses > 0:
+            self._print(f"[INFO] Cache de emociones: {gate.hit_rate:.0%} de aciertos ({gate.hits}/{gate.hits + gate.misses})")
+        if self._journal:
+            self._journal.close()
+            self._print(f"[INFO] Registros en el diario: {self._journal.written}")
+        if self._pipeline.recorder is not None:
+            self._pipeline.recorder.save(self._config.output.trace_path)
+            self._print(f"[INFO] Traza de landmarks guardada: {len(self._pipeline.recorder)} frames")
+        if not self._headless:
+            cv2.destroyAllWindows()
+        self._print("[INFO] Sistema detenido")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Sistema de analisis de emociones y atencion")
+    parser.add_argument("--source", default="0", help="Indice de camara o archivo de video")
+    parser.add_argument("--shared-capture", action="store_true", help="Capturar en un proceso aparte con memoria compartida")
+    parser.add_argument("--headless", action="store_true", help="Sin ventana: emite los estados como JSON por linea")
+    parser.add_argument("--output", default="-", help="Destino de los estados: '-' (stdout), archivo o tcp://host:puerto")
+    parser.add_argument("--transitions-only", action="store_true", help="Emitir solo cambios de estado")
+    parser.add_argument("--journal", default=None, help="Diario binario de estados (.stj) para sesiones largas")
+    parser.add_argument("--trace", default=None, help="Grabar landmarks y puntuaciones (.npz) para reproducir sin camara")
+    parser.add_argument("--sync-init", action="store_true", help="Cargar los modelos antes de abrir la camara")
+    args = parser.parse_args()
+
     config = AppConfig()
+    config.capture.source = parse_source(args.source)
+    config.capture.shared_memory = args.shared_capture
+    config.output.headless = args.headless
+    config.output.state_output = args.output
+    config.output.transitions_only = args.transitions_only
+    config.output.journal_path = args.journal
+    config.output.trace_path = args.trace
+    config.background_init = not args.sync_init and isinstance(config.capture.source, int)
     app = Application(config)
     app.run()
 
@@ -0,0 +1,196 @@
+import logging
+import threading
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from config import MetricsConfig
+
+
+logger = logging.getLogger("METRICS")
+logger.setLevel(logging.INFO)
+
+
+class LatencyHistogram:
+    BUCKETS = np.array([
+        0.0005, 0.001, 0.0025, 0.005, 0.0075, 0.01, 0.015, 0.02,
+        0.03, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0
+    ])
+
+    def __init__(self, window: int = 1024):
+        self._counts = np.zeros(len(self.BUCKETS) + 1, dtype=np.int64)
+        self._sum = 0.0
+        self._count = 0
+        self._window = np.zeros(window, dtype=np.float64)
+        self._window_pos = 0
+
+    def observe(self, seconds: float):
+        self._counts[np.searchsorted(self.BUCKETS, seconds)] += 1
+        self._sum += seconds
+        self._count += 1
+        self._window[self._window_pos % len(self._window)] = seconds
+        self._window_pos += 1
+
+    def quantiles(self) -> Dict[str, float]:
+        samples = self._window[:min(self._window_pos, len(self._window))]
+        if samples.size == 0:
+            return {"0.5": 0.0, "0.95": 0.0, "0.99": 0.0}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return {"0.5": float(p50), "0.95": float(p95), "0.99": float(p99)}
+
+    @property
+    def cumulative_counts(self) -> np.ndarray:
+        return np.cumsum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+class PipelineMetrics:
+    def __init__(self, config: MetricsConfig = None):
+        self._config = config or MetricsConfig()
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._frames_processed = 0
+        self._frames_skipped = 0
+        self._faces_detected = 0
+        self._emotion_inferences = 0
+        self._gate_hits = 0
+        self._gate_misses = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._reporter: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def observe(
+        self,
+        timings: Dict[str, float],
+        face_detected: bool,
+        emotion_inferred: bool,
+        gate_hit: Optional[bool] = None
+    ):
+        with self._lock:
+            for stage, seconds in timings.items():
+                histogram = self._histograms.get(stage)
+                if histogram is None:
+                    histogram = self._histograms[stage] = LatencyHistogram()
+                histogram.observe(seconds)
+            self._frames_processed += 1
+            self._faces_detected += face_detected
+            self._emotion_inferences += emotion_inferred
+            if gate_hit is not None:
+                self._gate_hits += gate_hit
+                self._gate_misses += not gate_hit
+
+    def record_skipped(self):
+        with self._lock:
+            self._frames_skipped += 1
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP emotion_stage_latency_seconds Latencia por etapa del pipeline",
+                "# TYPE emotion_stage_latency_seconds histogram"
+            ]
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = histogram.cumulative_counts
+                for bound, count in zip(LatencyHistogram.BUCKETS, cumulative):
+                    lines.append(f'emotion_stage_latency_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+                lines.append(f'emotion_stage_latency_seconds_bucket{{stage="{stage}",le="+Inf"}} {cumulative[-1]}')
+                lines.append(f'emotion_stage_latency_seconds_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'emotion_stage_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            lines += [
+                "# HELP emotion_stage_latency_quantile_seconds Cuantiles recientes de latencia por etapa",
+                "# TYPE emotion_stage_latency_quantile_seconds gauge"
+            ]
+            for stage, histogram in sorted(self._histograms.items()):
+                for quantile, value in histogram.quantiles().items():
+                    lines.append(f'emotion_stage_latency_quantile_seconds{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+
+            counters = {
+                "emotion_frames_processed_total": self._frames_processed,
+                "emotion_frames_skipped_total": self._frames_skipped,
+                "emotion_faces_detected_total": self._faces_detected,
+                "emotion_inferences_total": self._emotion_inferences,
+                "emotion_gate_hits_total": self._gate_hits,
+                "emotion_gate_misses_total": self._gate_misses
+            }
+            for name, value in counters.items():
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value}")
+
+            lines.append("# TYPE emotion_face_detected_ratio gauge")
+            lines.append(f"emotion_face_detected_ratio {self._face_ratio():.4f}")
+            lines.append("# TYPE emotion_gate_hit_ratio gauge")
+            lines.append(f"emotion_gate_hit_ratio {self._gate_ratio():.4f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        with self._lock:
+            parts = [
+                f"frames={self._frames_processed} omitidos={self._frames_skipped} "
+                f"rostro={self._face_ratio():.0%} inferencias={self._emotion_inferences}"
+            ]
+            if self._gate_hits + self._gate_misses:
+                parts.append(f"cache_emociones={self._gate_ratio():.0%}")
+            for stage, histogram in sorted(self._histograms.items()):
+                q = histogram.quantiles()
+                parts.append(
+                    f"{stage} p50/p95/p99={q['0.5'] * 1000:.1f}/{q['0.95'] * 1000:.1f}/{q['0.99'] * 1000:.1f}ms"
+                )
+        return " | ".join(parts)
+
+    def _face_ratio(self) -> float:
+        return self._faces_detected / self._frames_processed if self._frames_processed else 0.0
+
+    def _gate_ratio(self) -> float:
+        total = self._gate_hits + self._gate_misses
+        return self._gate_hits / total if total else 0.0
+
+    def start(self):
+        self._stop_event.clear()
+        if self._config.http_port > 0 and self._server is None:
+            self._server = ThreadingHTTPServer((self._config.http_host, self._config.http_port), self._handler())
+            threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+            logger.info(f"Metricas en http://{self._config.http_host}:{self._config.http_port}/metrics")
+        if self._config.log_interval_seconds > 0 and self._reporter is None:
+            self._reporter = threading.Thread(target=self._report_loop, name="MetricsReporter", daemon=True)
+            self._reporter.start()
+
+    def _report_loop(self):
+        while not self._stop_event.wait(self._config.log_interval_seconds):
+            logger.info(self.summary())
+
+    def _handler(self):
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
+
+    def stop(self):
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._reporter is not None:
+            self._reporter.join(timeout=1.0)
+            self._reporter = None
\ No newline at end of file
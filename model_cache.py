@@ -0,0 +1,347 @@
+import os
+import sys
+import json
+import mmap
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import platform
+import subprocess
+import tempfile
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from config import EmotionConfig
+from inference_backends import model_input_size
+
+
+logger = logging.getLogger("MODEL_CACHE")
+
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "example_face", "models")
+WEIGHTS_DIR = os.path.join(os.path.expanduser("~"), ".hsemotion")
+METADATA_FILE = "metadata.json"
+
+ARTIFACT_FILES = {
+    "torchscript": "model.pt",
+    "onnxruntime": "model.onnx",
+    "tflite": "model.tflite"
+}
+
+
+@dataclass
+class ExportOptions:
+    input_size: int = 224
+    opset: int = 13
+    simplify: bool = True
+    quantize: str = "none"
+    calibration: str = ""
+
+    @classmethod
+    def from_config(cls, config: EmotionConfig) -> "ExportOptions":
+        calibration = ""
+        if config.quantize == "static":
+            from emotion_quantization import calibration_digest
+
+            if not config.calibration_dir:
+                raise ValueError("La cuantizacion estatica requiere calibration_dir")
+            calibration = f"{calibration_digest(config.calibration_dir)}:{config.calibration_method}:{config.calibration_limit or 0}"
+        return cls(
+            input_size=model_input_size(config.model_name),
+            opset=config.export_opset,
+            simplify=config.export_simplify,
+            quantize=config.quantize,
+            calibration=calibration
+        )
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            for start in range(0, len(view), chunk_size):
+                digest.update(view[start:start + chunk_size])
+            view.release()
+    return digest.hexdigest()
+
+
+def weights_path(model_name: str) -> str:
+    return os.path.join(WEIGHTS_DIR, model_name + ".pt")
+
+
+def _load_recognizer(config: EmotionConfig):
+    from hsemotion.facial_emotions import HSEmotionRecognizer
+    return HSEmotionRecognizer(model_name=config.model_name, device="cpu")
+
+
+def classifier_model(recognizer):
+    import torch
+
+    model = getattr(recognizer, "model", None) or getattr(recognizer, "net", None)
+    if model is None:
+        raise ValueError("No se encontro el modelo dentro de HSEmotionRecognizer")
+    model = model.float().eval().cpu()
+    weights = getattr(recognizer, "classifier_weights", None)
+    if weights is None:
+        return model
+
+    head = torch.nn.Linear(weights.shape[1], weights.shape[0])
+    with torch.no_grad():
+        head.weight.copy_(torch.as_tensor(weights, dtype=torch.float32))
+        head.bias.copy_(torch.as_tensor(recognizer.classifier_bias, dtype=torch.float32))
+    return torch.nn.Sequential(model, head).eval()
+
+
+class ModelCache:
+    def __init__(self, root: Optional[str] = None):
+        self._root = os.path.expanduser(root or DEFAULT_CACHE_DIR)
+
+    def key(self, weights_sha256: str, target: str, options: ExportOptions) -> str:
+        payload = json.dumps({
+            "version": CACHE_VERSION,
+            "weights": weights_sha256,
+            "target": target,
+            "options": asdict(options)
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+    def entry_dir(self, model_name: str, target: str, key: str) -> str:
+        return os.path.join(self._root, f"{model_name}-{target}-{key}")
+
+    def lookup(self, model_name: str, target: str, key: str) -> Optional[str]:
+        entry = self.entry_dir(model_name, target, key)
+        artifact = os.path.join(entry, ARTIFACT_FILES[target])
+        try:
+            with open(os.path.join(entry, METADATA_FILE), "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(artifact) or os.path.getsize(artifact) != metadata.get("artifact_size"):
+            logger.warning(f"Artefacto incompleto en cache, se reconstruira: {entry}")
+            return None
+        return artifact
+
+    def ensure(self, config: EmotionConfig) -> str:
+        target = config.backend
+        if target not in ARTIFACT_FILES:
+            raise ValueError(f"El backend {target} no usa artefactos en cache")
+
+        source = weights_path(config.model_name)
+        recognizer = None
+        if not os.path.exists(source):
+            recognizer = _load_recognizer(config)
+
+        options = ExportOptions.from_config(config)
+        weights_sha256 = file_sha256(source)
+        key = self.key(weights_sha256, target, options)
+        artifact = self.lookup(config.model_name, target, key)
+        if artifact is not None:
+            return artifact
+
+        logger.info(f"Construyendo artefacto {target} para {config.model_name} ({key})")
+        return self._build(config, target, options, source, weights_sha256, key, recognizer)
+
+    def _build(
+        self,
+        config: EmotionConfig,
+        target: str,
+        options: ExportOptions,
+        source: str,
+        weights_sha256: str,
+        key: str,
+        recognizer=None
+    ) -> str:
+        os.makedirs(self._root, exist_ok=True)
+        started = time.perf_counter()
+        staging = tempfile.mkdtemp(prefix=".build-", dir=self._root)
+        try:
+            model = classifier_model(recognizer or _load_recognizer(config))
+            artifact = os.path.join(staging, ARTIFACT_FILES[target])
+            if target == "torchscript":
+                versions = _export_torchscript(model, artifact, options)
+            else:
+                onnx_path = os.path.join(staging, "export.onnx")
+                versions = _export_onnx(model, onnx_path, options, config)
+                if target == "onnxruntime":
+                    os.replace(onnx_path, artifact)
+                else:
+                    versions.update(_convert_tflite(onnx_path, artifact, staging))
+
+            metadata = {
+                "version": CACHE_VERSION,
+                "key": key,
+                "model_name": config.model_name,
+                "target": target,
+                "options": asdict(options),
+                "weights_path": source,
+                "weights_sha256": weights_sha256,
+                "artifact": ARTIFACT_FILES[target],
+                "artifact_size": os.path.getsize(artifact),
+                "artifact_sha256": file_sha256(artifact),
+                "build_seconds": round(time.perf_counter() - started, 3),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "host": platform.node(),
+                "python": platform.python_version(),
+                "tools": versions
+            }
+            with open(os.path.join(staging, METADATA_FILE), "w", encoding="utf-8") as f:
+                json.dump(metadata, f, indent=2)
+
+            entry = self.entry_dir(config.model_name, target, key)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                if self.lookup(config.model_name, target, key) is None:
+                    raise
+                logger.info(f"Otro proceso construyo el mismo artefacto: {entry}")
+                shutil.rmtree(staging, ignore_errors=True)
+            return os.path.join(entry, ARTIFACT_FILES[target])
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def entries(self) -> List[Dict[str, object]]:
+        if not os.path.isdir(self._root):
+            return []
+        entries = []
+        for name in sorted(os.listdir(self._root)):
+            try:
+                with open(os.path.join(self._root, name, METADATA_FILE), "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                continue
+            metadata["path"] = os.path.join(self._root, name)
+            entries.append(metadata)
+        return entries
+
+    def remove(self, key: str) -> int:
+        removed = 0
+        for entry in self.entries():
+            if entry["key"].startswith(key):
+                shutil.rmtree(entry["path"])
+                removed += 1
+        return removed
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+
+def _export_torchscript(model, path: str, options: ExportOptions) -> Dict[str, str]:
+    import torch
+
+    example = torch.zeros(1, 3, options.input_size, options.input_size)
+    with torch.no_grad():
+        scripted = torch.jit.trace(model, example)
+        scripted = torch.jit.freeze(scripted)
+    scripted.save(path)
+    return {"torch": torch.__version__}
+
+
+def _export_onnx(model, path: str, options: ExportOptions, config: EmotionConfig) -> Dict[str, str]:
+    import torch
+    import onnx
+
+    example = torch.zeros(1, 3, options.input_size, options.input_size)
+    torch.onnx.export(
+        model,
+        example,
+        path,
+        input_names=["input"],
+        output_names=["output"],
+        dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}},
+        opset_version=options.opset
+    )
+    versions = {"torch": torch.__version__, "onnx": onnx.__version__}
+
+    if options.simplify:
+        try:
+            import onnxsim
+        except ImportError:
+            logger.warning("onnx-simplifier no esta instalado, se omite la simplificacion")
+        else:
+            simplified, valid = onnxsim.simplify(onnx.load(path))
+            if valid:
+                onnx.save(simplified, path)
+                versions["onnxsim"] = onnxsim.__version__
+
+    if options.quantize in ("dynamic", "static"):
+        from onnxruntime import __version__ as ort_version
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized = path + ".int8"
+        if options.quantize == "dynamic":
+            quantize_dynamic(path, quantized, weight_type=QuantType.QInt8)
+        else:
+            from emotion_quantization import quantize_static_model
+
+            quantize_static_model(
+                path,
+                quantized,
+                config.calibration_dir,
+                config.calibration_limit,
+                config.calibration_method
+            )
+        os.replace(quantized, path)
+        versions["onnxruntime"] = ort_version
+    elif options.quantize != "none":
+        raise ValueError(f"Modo de cuantizacion desconocido: {options.quantize}")
+    return versions
+
+
+def _convert_tflite(onnx_path: str, path: str, staging: str) -> Dict[str, str]:
+    output_dir = os.path.join(staging, "tflite")
+    subprocess.run(["onnx2tf", "-i", onnx_path, "-o", output_dir], check=True)
+    candidates = [name for name in os.listdir(output_dir) if name.endswith("_float32.tflite")]
+    if not candidates:
+        raise FileNotFoundError(f"onnx2tf no genero un modelo float32 en {output_dir}")
+    os.replace(os.path.join(output_dir, candidates[0]), path)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return {"onnx2tf": "cli"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache de modelos de emociones optimizados")
+    parser.add_argument("--backend", default="onnxruntime", choices=sorted(ARTIFACT_FILES), help="Backend de destino")
+    parser.add_argument("--model-name", default=EmotionConfig.model_name, help="Modelo de HSEmotion")
+    parser.add_argument("--quantize", default="none", choices=["none", "dynamic", "static"], help="Cuantizacion del modelo ONNX")
+    parser.add_argument("--calibration", default=None, help="Recortes de rostros para la cuantizacion estatica")
+    parser.add_argument("--no-simplify", action="store_true", help="No simplificar el grafo ONNX")
+    parser.add_argument("--cache-dir", default=None, help=f"Directorio de la cache (por defecto {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--list", action="store_true", help="Listar los artefactos en cache")
+    parser.add_argument("--remove", default=None, help="Eliminar artefactos cuya clave empiece por este prefijo")
+    args = parser.parse_args()
+
+    cache = ModelCache(args.cache_dir)
+    if args.list:
+        for entry in cache.entries():
+            size_mb = entry["artifact_size"] / (1024 * 1024)
+            print(f"{entry['key']}  {entry['model_name']:<24} {entry['target']:<12} {size_mb:6.1f} MB  {entry['created']}")
+        return
+    if args.remove:
+        print(f"[INFO] Artefactos eliminados: {cache.remove(args.remove)}")
+        return
+
+    config = EmotionConfig(
+        model_name=args.model_name,
+        backend=args.backend,
+        export_simplify=not args.no_simplify,
+        quantize=args.quantize,
+        calibration_dir=args.calibration
+    )
+    started = time.perf_counter()
+    try:
+        artifact = cache.ensure(config)
+    except (ImportError, ValueError, OSError, subprocess.CalledProcessError) as e:
+        print(f"[ERROR] No se pudo construir el artefacto: {e}")
+        sys.exit(1)
+    print(f"[INFO] Artefacto listo en {time.perf_counter() - started:.2f}s: {artifact}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger("MODEL_LOADER")
+
+
+@dataclass
+class ModelTiming:
+    name: str
+    load_seconds: float = 0.0
+    warmup_seconds: float = 0.0
+    ready_at: float = 0.0
+
+
+class ModelLoader:
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Optional[Callable[[Any], None]]] = {}
+        self._models: Dict[str, Any] = {}
+        self._timings: Dict[str, ModelTiming] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._pending = 0
+        self._error: Optional[BaseException] = None
+        self._started_at = 0.0
+        self._ready_at = 0.0
+
+    def add(self, name: str, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None):
+        self._factories[name] = factory
+        self._warmups[name] = warmup
+
+    def start(self):
+        if self._threads:
+            return
+        self._started_at = time.perf_counter()
+        self._pending = len(self._factories)
+        if self._pending == 0:
+            self._finish()
+            return
+        for name in self._factories:
+            thread = threading.Thread(target=self._load, args=(name,), name=f"Load{name.title()}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _load(self, name: str):
+        timing = ModelTiming(name=name)
+        try:
+            started = time.perf_counter()
+            model = self._factories[name]()
+            timing.load_seconds = time.perf_counter() - started
+            warmup = self._warmups[name]
+            if warmup is not None:
+                started = time.perf_counter()
+                warmup(model)
+                timing.warmup_seconds = time.perf_counter() - started
+            timing.ready_at = time.perf_counter() - self._started_at
+        except BaseException as e:
+            logger.error(f"No se pudo cargar el modelo '{name}': {e}")
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+            self._done.set()
+            return
+
+        with self._lock:
+            self._models[name] = model
+            self._timings[name] = timing
+            self._pending -= 1
+            if self._pending == 0:
+                self._finish()
+
+    def _finish(self):
+        self._ready_at = time.perf_counter() - self._started_at
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._done.wait(timeout)
+        return self.is_ready
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def get(self, name: str) -> Any:
+        with self._lock:
+            return self._models.get(name)
+
+    def report(self) -> List[str]:
+        lines = []
+        for name in self._factories:
+            timing = self._timings.get(name)
+            if timing is None:
+                lines.append(f"  {name:<10} pendiente")
+                continue
+            lines.append(
+                f"  {name:<10} carga {timing.load_seconds * 1000:8.1f} ms | "
+                f"calentamiento {timing.warmup_seconds * 1000:8.1f} ms | "
+                f"listo a los {timing.ready_at * 1000:8.1f} ms"
+            )
+        return lines
+
+    @property
+    def is_ready(self) -> bool:
+        return self._done.is_set() and self._error is None
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self._error
+
+    @property
+    def ready_seconds(self) -> float:
+        return self._ready_at
+
+    @property
+    def timings(self) -> Dict[str, ModelTiming]:
+        return dict(self._timings)
\ No newline at end of file
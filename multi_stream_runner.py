@@ -0,0 +1,236 @@
+import os
+import time
+import argparse
+import threading
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Union
+from config import AppConfig, CaptureConfig
+from video_capture import create_capture, parse_source
+from analysis_pipeline import AnalysisPipeline
+from emotion_inference_service import EmotionInferenceService, ServiceBackend
+from state_aggregator import CombinedState
+
+
+@dataclass
+class StreamStats:
+    stream_id: int
+    source: Union[int, str]
+    frames: int
+    fps: float
+    latency_ms_p50: float
+    latency_ms_p95: float
+    dropped_frames: int
+    finished: bool
+
+
+@dataclass
+class _Stream:
+    stream_id: int
+    source: Union[int, str]
+    capture: object
+    pipeline: AnalysisPipeline
+    live: bool
+    busy: bool = False
+    finished: bool = False
+    frames: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=300))
+    completions: Deque[float] = field(default_factory=lambda: deque(maxlen=60))
+
+
+class MultiStreamRunner:
+    def __init__(
+        self,
+        sources: List[Union[int, str]],
+        config: AppConfig = None,
+        workers: int = None,
+        shared_emotion: bool = False,
+        on_result: Optional[Callable[[int, CombinedState], None]] = None
+    ):
+        self._sources = sources
+        self._config = config or AppConfig()
+        self._workers = workers or os.cpu_count() or 1
+        self._shared_emotion = shared_emotion
+        self._on_result = on_result
+        self._streams: List[_Stream] = []
+        self._emotion_service: Optional[EmotionInferenceService] = None
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._next_stream = 0
+        self._running = False
+
+    def open(self) -> bool:
+        if self._shared_emotion:
+            self._emotion_service = EmotionInferenceService(self._config.emotion)
+            self._emotion_service.start()
+
+        for stream_id, source in enumerate(self._sources):
+            live = isinstance(source, int)
+            capture_config = CaptureConfig(source=source, threaded=live)
+            capture = create_capture(source, capture_config)
+            if not capture.open():
+                print(f"[ERROR] No se pudo abrir la fuente: {source}")
+                continue
+
+            backend = ServiceBackend(self._emotion_service) if self._emotion_service else None
+            pipeline = AnalysisPipeline(self._config, emotion_backend=backend)
+            pipeline.update_image_size(*capture.frame_size)
+            self._streams.append(_Stream(stream_id, source, capture, pipeline, live))
+
+        return len(self._streams) > 0
+
+    def run(self, duration: Optional[float] = None, report_seconds: float = 5.0):
+        self._running = True
+        started = time.monotonic()
+        next_report = started + report_seconds
+
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="StreamWorker") as executor:
+            while self._running:
+                self._dispatch(executor)
+
+                with self._condition:
+                    self._condition.wait(timeout=0.05)
+
+                now = time.monotonic()
+                if report_seconds > 0 and now >= next_report:
+                    self.print_report()
+                    next_report = now + report_seconds
+                if duration is not None and now - started >= duration:
+                    self._running = False
+                if all(stream.finished for stream in self._streams):
+                    self._running = False
+
+            with self._condition:
+                self._condition.wait_for(lambda: self._in_flight == 0)
+
+        self.print_report()
+
+    def _dispatch(self, executor: ThreadPoolExecutor):
+        count = len(self._streams)
+        if count == 0:
+            return
+        with self._condition:
+            start = self._next_stream
+        next_stream = start
+        for offset in range(count):
+            with self._condition:
+                if self._in_flight >= self._workers:
+                    break
+                index = (start + offset) % count
+                stream = self._streams[index]
+                if stream.busy or stream.finished:
+                    continue
+                stream.busy = True
+                self._in_flight += 1
+
+            next_stream = (index + 1) % count
+            executor.submit(self._step, stream)
+
+        with self._condition:
+            self._next_stream = next_stream
+
+    def _step(self, stream: _Stream):
+        try:
+            captured = stream.capture.read_frame(timeout=0.1)
+            if captured is None:
+                if not stream.live or not stream.capture.is_opened:
+                    stream.finished = True
+                return
+
+            state, _ = stream.pipeline.process(captured.frame)
+            now = time.monotonic()
+            stream.frames += 1
+            stream.latencies.append(now - captured.timestamp)
+            stream.completions.append(now)
+
+            if self._on_result:
+                self._on_result(stream.stream_id, state)
+        except Exception as e:
+            print(f"[ERROR] Fuente {stream.source}: {e}")
+            stream.finished = True
+        finally:
+            with self._condition:
+                stream.busy = False
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def stats(self) -> List[StreamStats]:
+        result = []
+        for stream in self._streams:
+            completions = list(stream.completions)
+            span = completions[-1] - completions[0] if len(completions) > 1 else 0.0
+            latencies = np.array(stream.latencies) * 1000.0
+            result.append(StreamStats(
+                stream_id=stream.stream_id,
+                source=stream.source,
+                frames=stream.frames,
+                fps=(len(completions) - 1) / span if span > 0 else 0.0,
+                latency_ms_p50=float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+                latency_ms_p95=float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+                dropped_frames=stream.capture.dropped_frames,
+                finished=stream.finished
+            ))
+        return result
+
+    def print_report(self):
+        stats = self.stats()
+        total_fps = sum(s.fps for s in stats)
+        cores = os.cpu_count() or 1
+        print("=" * 60)
+        for s in stats:
+            status = "FIN" if s.finished else "OK"
+            print(
+                f"[STREAM {s.stream_id}] {str(s.source)[:24]:<24} {status:<3} | frames: {s.frames:>6} | "
+                f"fps: {s.fps:5.1f} | latencia p50/p95: {s.latency_ms_p50:6.1f}/{s.latency_ms_p95:6.1f} ms | "
+                f"perdidos: {s.dropped_frames}"
+            )
+        print(f"[TOTAL] {len(stats)} fuente(s) | {total_fps:.1f} fps | {total_fps / cores:.2f} fps por nucleo")
+        if self._emotion_service:
+            service_stats = self._emotion_service.stats()
+            print(f"[EMOCION] lote medio: {service_stats['mean_batch_size']:.2f} | espera p95: {service_stats['queue_wait_ms_p95']:.1f} ms")
+
+    def stop(self):
+        self._running = False
+
+    def release(self):
+        for stream in self._streams:
+            stream.capture.release()
+            stream.pipeline.release()
+        if self._emotion_service:
+            self._emotion_service.stop()
+
+    @property
+    def streams(self) -> Dict[int, Union[int, str]]:
+        return {stream.stream_id: stream.source for stream in self._streams}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analisis simultaneo de varias camaras, videos o directorios de imagenes")
+    parser.add_argument("sources", nargs="+", help="Indices de camara, archivos de video o directorios de imagenes")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Hilos de procesamiento (por defecto: nucleos)")
+    parser.add_argument("--duration", type=float, default=None, help="Segundos de ejecucion (por defecto: hasta terminar)")
+    parser.add_argument("--report-seconds", type=float, default=5.0, help="Intervalo del reporte por fuente")
+    parser.add_argument("--shared-emotion", action="store_true", help="Un solo modelo de emociones con inferencia por lotes")
+    args = parser.parse_args()
+
+    runner = MultiStreamRunner(
+        [parse_source(source) for source in args.sources],
+        workers=args.workers,
+        shared_emotion=args.shared_emotion
+    )
+    if not runner.open():
+        print("[ERROR] No se pudo abrir ninguna fuente")
+        return
+
+    try:
+        runner.run(duration=args.duration, report_seconds=args.report_seconds)
+    except KeyboardInterrupt:
+        runner.stop()
+    finally:
+        runner.release()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import time
+import queue
+import logging
+import threading
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Tuple, Callable, List
+from analysis_pipeline import AnalysisPipeline, FrameTask
+from state_aggregator import StateAggregator, CombinedState
+
+
+logger = logging.getLogger("PIPELINE")
+
+
+@dataclass
+class PipelineResult:
+    sequence: int
+    state: CombinedState
+    bbox: Optional[Tuple[int, int, int, int]]
+    error: Optional[Exception] = None
+
+
+class PipelinedExecutor:
+    _STOP = object()
+
+    def __init__(self, pipeline: AnalysisPipeline, queue_size: int = 2):
+        self._pipeline = pipeline
+        self._fallback_aggregator = StateAggregator()
+        self._queue_size = max(1, queue_size)
+        self._queues: List[queue.Queue] = []
+        self._workers: List[threading.Thread] = []
+        self._sequence = 0
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+
+        stages = [
+            ("Detection", self._pipeline.run_detection),
+            ("Landmarks", self._pipeline.run_landmarks),
+            ("Emotion", self._run_emotion_and_finalize),
+        ]
+        self._queues = [queue.Queue(maxsize=self._queue_size) for _ in range(len(stages) + 1)]
+
+        for index, (name, stage) in enumerate(stages):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(stage, self._queues[index], self._queues[index + 1]),
+                name=f"Pipeline{name}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        self._running = True
+
+    def _run_emotion_and_finalize(self, task: FrameTask):
+        self._pipeline.run_emotion(task)
+        self._pipeline.finalize(task)
+
+    def _worker_loop(
+        self,
+        stage: Callable[[FrameTask], None],
+        input_queue: queue.Queue,
+        output_queue: queue.Queue
+    ):
+        while True:
+            task = input_queue.get()
+            if task is self._STOP:
+                output_queue.put(self._STOP)
+                break
+            if task.error is None:
+                try:
+                    stage(task)
+                except Exception as e:
+                    logger.exception(f"Fallo una etapa del pipeline en el frame {task.sequence}")
+                    task.error = e
+                    task.bbox = None
+                    task.state = self._fallback_aggregator.aggregate(face_detected=False)
+            output_queue.put(task)
+
+    def submit(
+        self,
+        frame: np.ndarray,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        sequence: Optional[int] = None
+    ) -> bool:
+        if not self._running:
+            return False
+
+        task = self._pipeline.new_task(frame, self._sequence + 1 if sequence is None else sequence)
+        try:
+            self._queues[0].put(task, block=block, timeout=timeout)
+        except queue.Full:
+            return False
+
+        self._sequence = task.sequence
+        return True
+
+    def get_result(self, block: bool = True, timeout: Optional[float] = None) -> Optional[PipelineResult]:
+        if not self._queues:
+            return None
+
+        try:
+            task = self._queues[-1].get(block=block, timeout=timeout)
+        except queue.Empty:
+            return None
+
+        if task is self._STOP:
+            return None
+        return PipelineResult(sequence=task.sequence, state=task.state, bbox=task.bbox, error=task.error)
+
+    def stop(self, timeout: float = 5.0):
+        if not self._running:
+            return
+
+        self._running = False
+        deadline = time.monotonic() + timeout
+        stop_sent = False
+        stopped = False
+        while time.monotonic() < deadline:
+            if not stop_sent:
+                try:
+                    self._queues[0].put_nowait(self._STOP)
+                    stop_sent = True
+                except queue.Full:
+                    pass
+            try:
+                item = self._queues[-1].get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if item is self._STOP:
+                stopped = True
+                break
+
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+        alive = [worker.name for worker in self._workers if worker.is_alive()]
+        if not stopped or alive:
+            logger.error(f"El pipeline no se detuvo a tiempo; hilos activos: {alive}")
+        self._workers = []
+        self._queues = []
+
+    @property
+    def max_frames_in_flight(self) -> int:
+        return 3 * (self._queue_size + 1)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
\ No newline at end of file
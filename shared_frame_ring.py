@@ -0,0 +1,298 @@
+import cv2
+import time
+import logging
+import multiprocessing
+import numpy as np
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Deque, Optional, Tuple, Union
+from config import CaptureConfig
+from video_capture import CapturedFrame
+
+
+logger = logging.getLogger("SHARED_CAPTURE")
+
+
+class SharedFrameRing:
+    WRITE_SEQUENCE = 0
+    READ_SEQUENCE = 1
+    CLOSED = 2
+    STOP = 3
+    GLOBALS = 8
+
+    WRITING = -1
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, shape: Tuple[int, int, int], owner: bool):
+        self._shm = shm
+        self._slots = slots
+        self._shape = shape
+        self._owner = owner
+        control_size = self.control_size(slots)
+        buffer = shm.buf
+        self._globals = np.ndarray((self.GLOBALS,), dtype=np.int64, buffer=buffer, offset=0)
+        self._sequences = np.ndarray((slots,), dtype=np.int64, buffer=buffer, offset=self.GLOBALS * 8)
+        self._pins = np.ndarray((slots,), dtype=np.int64, buffer=buffer, offset=(self.GLOBALS + slots) * 8)
+        self._timestamps = np.ndarray((slots,), dtype=np.float64, buffer=buffer, offset=(self.GLOBALS + 2 * slots) * 8)
+        self._frames = np.ndarray((slots,) + shape, dtype=np.uint8, buffer=buffer, offset=control_size)
+
+    @staticmethod
+    def control_size(slots: int) -> int:
+        size = (SharedFrameRing.GLOBALS + 3 * slots) * 8
+        return (size + 63) // 64 * 64
+
+    @classmethod
+    def create(cls, slots: int, shape: Tuple[int, int, int]) -> "SharedFrameRing":
+        size = cls.control_size(slots) + slots * int(np.prod(shape))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        ring = cls(shm, slots, shape, owner=True)
+        ring._globals[:] = 0
+        ring._sequences[:] = 0
+        ring._pins[:] = 0
+        ring._timestamps[:] = 0.0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, slots: int, shape: Tuple[int, int, int]) -> "SharedFrameRing":
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, slots, shape, owner=False)
+
+    def acquire_write_slot(self, latest: bool) -> Optional[int]:
+        free = (self._pins == 0) & (self._sequences != self.WRITING)
+        if not latest:
+            free &= self._sequences <= self._globals[self.READ_SEQUENCE]
+        candidates = np.flatnonzero(free)
+        if candidates.size == 0:
+            return None
+        slot = int(candidates[np.argmin(self._sequences[candidates])])
+        self._sequences[slot] = self.WRITING
+        return slot
+
+    def publish(self, slot: int, timestamp: float) -> int:
+        sequence = int(self._globals[self.WRITE_SEQUENCE]) + 1
+        self._timestamps[slot] = timestamp
+        self._sequences[slot] = sequence
+        self._globals[self.WRITE_SEQUENCE] = sequence
+        return sequence
+
+    def abandon(self, slot: int):
+        self._sequences[slot] = 0
+
+    def readable_slot(self, latest: bool) -> Optional[int]:
+        unread = np.flatnonzero(self._sequences > self._globals[self.READ_SEQUENCE])
+        if unread.size == 0:
+            return None
+        sequences = self._sequences[unread]
+        return int(unread[np.argmax(sequences) if latest else np.argmin(sequences)])
+
+    def close(self):
+        self._globals = self._sequences = self._pins = self._timestamps = self._frames = None
+        try:
+            self._shm.close()
+        except BufferError:
+            logger.warning("Quedan vistas de frames abiertas sobre la memoria compartida")
+        if self._owner:
+            self._shm.unlink()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    @property
+    def globals(self) -> np.ndarray:
+        return self._globals
+
+    @property
+    def sequences(self) -> np.ndarray:
+        return self._sequences
+
+    @property
+    def pins(self) -> np.ndarray:
+        return self._pins
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps
+
+    @property
+    def frames(self) -> np.ndarray:
+        return self._frames
+
+
+def _store_frame(target: np.ndarray, frame: np.ndarray):
+    if np.shares_memory(frame, target):
+        return
+    if frame.shape == target.shape:
+        np.copyto(target, frame)
+    else:
+        cv2.resize(frame, (target.shape[1], target.shape[0]), dst=target)
+
+
+def _capture_worker(source: Union[int, str], slots: int, latest: bool, condition, connection):
+    cap = cv2.VideoCapture(source)
+    ret, pending = cap.read() if cap.isOpened() else (False, None)
+    if not ret:
+        connection.send(None)
+        connection.close()
+        cap.release()
+        return
+    if latest:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    connection.send(pending.shape)
+    ring = SharedFrameRing.attach(connection.recv(), slots, pending.shape)
+    connection.close()
+
+    try:
+        while True:
+            with condition:
+                slot = ring.acquire_write_slot(latest)
+                while slot is None and not ring.globals[SharedFrameRing.STOP]:
+                    condition.wait(timeout=0.1)
+                    slot = ring.acquire_write_slot(latest)
+                if ring.globals[SharedFrameRing.STOP]:
+                    break
+
+            if pending is not None:
+                _store_frame(ring.frames[slot], pending)
+                pending = None
+            else:
+                ret, frame = cap.read(ring.frames[slot])
+                if ret:
+                    _store_frame(ring.frames[slot], frame)
+                frame = None
+            timestamp = time.monotonic()
+
+            with condition:
+                if not ret:
+                    ring.abandon(slot)
+                    break
+                ring.publish(slot, timestamp)
+                condition.notify_all()
+    finally:
+        with condition:
+            ring.globals[SharedFrameRing.CLOSED] = 1
+            condition.notify_all()
+        cap.release()
+        ring.close()
+
+
+class SharedMemoryCapture:
+    def __init__(self, source: Union[int, str] = None, config: CaptureConfig = None):
+        self._config = config or CaptureConfig()
+        self._source = self._config.source if source is None else source
+        self._latest = isinstance(self._source, int)
+        self._context = multiprocessing.get_context("spawn")
+        self._condition = None
+        self._process = None
+        self._ring: Optional[SharedFrameRing] = None
+        self._pinned: Deque[int] = deque()
+        self._frame_size = (640, 480)
+        self._last_read_sequence = 0
+        self._dropped_frames = 0
+
+    def open(self) -> bool:
+        self._condition = self._context.Condition()
+        parent, child = self._context.Pipe()
+        slots = max(self._config.shared_slots, self._config.shared_pinned_frames + 2)
+        self._process = self._context.Process(
+            target=_capture_worker,
+            args=(self._source, slots, self._latest, self._condition, child),
+            name="SharedCapture",
+            daemon=True
+        )
+        self._process.start()
+        child.close()
+
+        try:
+            shape = parent.recv()
+        except EOFError:
+            shape = None
+        if shape is None:
+            self._process.join()
+            self._process = None
+            return False
+
+        self._ring = SharedFrameRing.create(slots, tuple(shape))
+        parent.send(self._ring.name)
+        parent.close()
+        self._frame_size = (shape[1], shape[0])
+        return True
+
+    def _unpin(self, keep: int):
+        while len(self._pinned) > keep:
+            self._ring.pins[self._pinned.popleft()] = 0
+
+    def read_frame(self, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        if self._ring is None:
+            return None
+
+        ring = self._ring
+        globals_ = ring.globals
+        with self._condition:
+            self._unpin(self._config.shared_pinned_frames - 1)
+            self._condition.notify_all()
+            has_frame = self._condition.wait_for(
+                lambda: ring.readable_slot(self._latest) is not None or globals_[SharedFrameRing.CLOSED],
+                timeout=self._config.read_timeout if timeout is None else timeout
+            )
+            slot = ring.readable_slot(self._latest) if has_frame else None
+            if slot is None:
+                return None
+
+            sequence = int(ring.sequences[slot])
+            ring.pins[slot] = 1
+            self._pinned.append(slot)
+            self._dropped_frames += sequence - self._last_read_sequence - 1
+            self._last_read_sequence = sequence
+            globals_[SharedFrameRing.READ_SEQUENCE] = sequence
+            timestamp = float(ring.timestamps[slot])
+            self._condition.notify_all()
+
+        return CapturedFrame(frame=ring.frames[slot], timestamp=timestamp, sequence=sequence)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        captured = self.read_frame()
+        if captured is None:
+            return False, None
+        return True, captured.frame
+
+    def release(self):
+        if self._ring is not None:
+            with self._condition:
+                self._ring.globals[SharedFrameRing.STOP] = 1
+                self._unpin(0)
+                self._condition.notify_all()
+        if self._process is not None:
+            self._process.join(timeout=self._config.read_timeout + 1.0)
+            if self._process.is_alive():
+                logger.error("El proceso de captura no termino a tiempo")
+                self._process.terminate()
+            self._process = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        return self._frame_size
+
+    @property
+    def is_opened(self) -> bool:
+        if self._ring is None:
+            return False
+        return not self._ring.globals[SharedFrameRing.CLOSED] or self._ring.readable_slot(self._latest) is not None
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames
+
+    @property
+    def last_sequence(self) -> int:
+        return self._last_read_sequence
\ No newline at end of file
@@ -22,10 +22,10 @@ if not hasattr(onnx, "mapping"):
 # --- FIN DEL PARCHE ---
 
 import torch
-import torch.nn as nn
 from onnx_tf.backend import prepare
 import tensorflow as tf
 from hsemotion.facial_emotions import HSEmotionRecognizer
+from model_cache import classifier_model
 
 print("=== Iniciando Conversión Inteligente (con Flex Ops) ===")
 
@@ -33,27 +33,17 @@ print("=== Iniciando Conversión Inteligente (con Flex Ops) ===")
 print("[1/5] Cargando librería HSEmotion...")
 recognizer = HSEmotionRecognizer(model_name='enet_b0_8_best_afew', device='cpu')
 
-# 2. Buscar modelo
-print("[2/5] Buscando modelo interno...")
-model = None
-for attr_name in dir(recognizer):
-    try:
-        attr_value = getattr(recognizer, attr_name)
-        if isinstance(attr_value, nn.Module):
-            print(f"   -> ¡Modelo encontrado en el atributo: '{attr_name}'!")
-            model = attr_value
-            break
-    except:
-        pass
-
-if model is None:
-    print("ERROR: No se encontró el modelo.")
-    exit(1)
-
-model.eval()
+# 2. Backbone + clasificador (HSEmotion deja el clasificador como Identity)
+print("[2/5] Uniendo backbone y clasificador...")
+model = classifier_model(recognizer)
 
 # 3. Dummy Input
 dummy_input = torch.randn(1, 3, 224, 224)
+with torch.no_grad():
+    output = model(dummy_input)
+if output.shape[1] != 8:
+    print(f"ERROR: La salida es {output.shape[1]}, se esperaban 8 emociones.")
+    exit(1)
 
 # 4. Exportar a ONNX
 print("[3/5] Exportando a ONNX...")
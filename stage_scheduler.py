@@ -0,0 +1,85 @@
+import logging
+import threading
+from typing import Dict, FrozenSet
+from config import SchedulerConfig
+
+
+logger = logging.getLogger("SCHEDULER")
+
+
+class StageScheduler:
+    STAGES = ("detection", "landmarks", "drowsiness", "attention", "emotion")
+    LANDMARK_CONSUMERS = ("drowsiness", "attention")
+
+    def __init__(self, config: SchedulerConfig = None):
+        self._config = config or SchedulerConfig()
+        self._cadences: Dict[str, int] = {stage: 1 for stage in self.STAGES}
+        self._latencies: Dict[str, float] = {}
+        self._frame_index = 0
+        self._lock = threading.Lock()
+
+    def next_stages(self) -> FrozenSet[str]:
+        due = {
+            stage for stage, cadence in self._cadences.items()
+            if self._frame_index % cadence == 0
+        }
+        if any(stage in due for stage in self.LANDMARK_CONSUMERS):
+            due.add("landmarks")
+        self._frame_index += 1
+
+        if self._frame_index % self._config.adapt_every_n_frames == 0:
+            self._adapt()
+        return frozenset(due)
+
+    def record(self, timings: Dict[str, float]):
+        alpha = self._config.latency_smoothing
+        with self._lock:
+            for stage, seconds in timings.items():
+                previous = self._latencies.get(stage)
+                milliseconds = seconds * 1000.0
+                self._latencies[stage] = milliseconds if previous is None else previous + alpha * (milliseconds - previous)
+
+    def _adapt(self):
+        with self._lock:
+            latencies = dict(self._latencies)
+        if not latencies:
+            return
+
+        cadences = {stage: 1 for stage in self.STAGES}
+        adjustable = [
+            stage for stage in self.STAGES
+            if stage not in self._config.critical_stages and stage in latencies
+        ]
+
+        while self._frame_cost(latencies, cadences) > self._config.frame_budget_ms:
+            candidates = [stage for stage in adjustable if cadences[stage] < self._config.max_cadence]
+            if not candidates:
+                break
+            costliest = max(candidates, key=lambda stage: latencies[stage] / cadences[stage])
+            cadences[costliest] += 1
+
+        if cadences != self._cadences:
+            logger.info(f"Cadencias actualizadas: {cadences}")
+            self._cadences = cadences
+
+    def _frame_cost(self, latencies: Dict[str, float], cadences: Dict[str, int]) -> float:
+        return sum(latency / cadences[stage] for stage, latency in latencies.items() if stage in cadences)
+
+    def reset(self):
+        self._cadences = {stage: 1 for stage in self.STAGES}
+        with self._lock:
+            self._latencies.clear()
+        self._frame_index = 0
+
+    @property
+    def cadences(self) -> Dict[str, int]:
+        return dict(self._cadences)
+
+    @property
+    def latencies_ms(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._latencies)
+
+    @property
+    def expected_frame_cost_ms(self) -> float:
+        return self._frame_cost(self.latencies_ms, self._cadences)
\ No newline at end of file
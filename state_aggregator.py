@@ -15,9 +15,21 @@ class CombinedState:
     final_state: str
     face_detected: bool
     calibrating: bool = False
+    warming_up: bool = False
 
 
 class StateAggregator:
+    FINAL_STATES = [
+        "sin_rostro",
+        "desconocido",
+        "durmiendo",
+        "no_mirando",
+        "frustrado",
+        "distraido",
+        "concentrado",
+        "entendiendo"
+    ]
+
     STATE_PRIORITY = {
         "durmiendo": 1,
         "no_mirando": 2,
@@ -36,9 +48,23 @@ class StateAggregator:
         emotion_scores: Dict[str, float] = None,
         drowsiness: DrowsinessResult = None,
         attention: AttentionResult = None,
-        calibrating: bool = False
+        calibrating: bool = False,
+        warming_up: bool = False
     ) -> CombinedState:
         
+        if warming_up:
+            return CombinedState(
+                cognitive_state="desconocido",
+                emotion="Unknown",
+                confidence=0.0,
+                emotion_scores={},
+                drowsiness=None,
+                attention=None,
+                final_state="desconocido",
+                face_detected=False,
+                warming_up=True
+            )
+        
         if not face_detected:
             return CombinedState(
                 cognitive_state="desconocido",
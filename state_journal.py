@@ -0,0 +1,217 @@
+import os
+import time
+import queue
+import logging
+import threading
+import numpy as np
+from typing import Dict, Optional
+from state_aggregator import CombinedState
+from state_timeline import StateTimeline
+from emotion_classifier import EmotionClassifier
+
+
+logger = logging.getLogger("JOURNAL")
+
+
+MAGIC = b"STJOURN1"
+HEADER_SIZE = 16
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("final_state", "u1"),
+    ("emotion", "u1"),
+    ("flags", "u1"),
+    ("reserved", "u1"),
+    ("confidence", "<f4"),
+    ("ear", "<f4"),
+    ("mar", "<f4"),
+    ("pitch", "<f4"),
+    ("yaw", "<f4"),
+    ("emotion_scores", "<f2", (len(EmotionClassifier.EMOTION_LABELS),))
+])
+
+FLAG_FACE_DETECTED = 1
+FLAG_CALIBRATING = 2
+FLAG_DROWSY = 4
+FLAG_YAWNING = 8
+FLAG_LOOKING = 16
+FLAG_WARMING_UP = 32
+
+
+def _header() -> bytes:
+    return MAGIC + np.array([RECORD_DTYPE.itemsize, 0], dtype="<u4").tobytes()
+
+
+def _check_header(path: str):
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"No es un diario de estados: {path}")
+    record_size = int(np.frombuffer(header[len(MAGIC):len(MAGIC) + 4], dtype="<u4")[0])
+    if record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Tamano de registro incompatible en {path}: {record_size}")
+
+
+class StateJournalWriter:
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 1.0):
+        self._path = path
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._final_codes = {name: i for i, name in enumerate(StateTimeline.FINAL_STATES)}
+        self._emotion_codes = {name: i for i, name in enumerate(StateTimeline.EMOTIONS)}
+        self._lock = threading.Lock()
+        self._pending = np.zeros(self._batch_size, dtype=RECORD_DTYPE)
+        self._pending_size = 0
+        self._batches: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._written = 0
+
+    def open(self):
+        if os.path.exists(self._path) and os.path.getsize(self._path) > 0:
+            _check_header(self._path)
+            size = os.path.getsize(self._path)
+            aligned = HEADER_SIZE + (size - HEADER_SIZE) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+            self._file = open(self._path, "r+b")
+            if aligned != size:
+                logger.warning(f"Registro incompleto descartado al final de {self._path}")
+                self._file.truncate(aligned)
+            self._file.seek(aligned)
+        else:
+            self._file = open(self._path, "wb")
+            self._file.write(_header())
+            self._file.flush()
+
+        self._thread = threading.Thread(target=self._writer_loop, name="StateJournal", daemon=True)
+        self._thread.start()
+
+    def append(self, state: CombinedState, timestamp: Optional[float] = None):
+        with self._lock:
+            record = self._pending[self._pending_size]
+            record["timestamp"] = time.time() if timestamp is None else timestamp
+            record["final_state"] = self._final_codes.get(state.final_state, self._final_codes["desconocido"])
+            record["emotion"] = self._emotion_codes.get(state.emotion, self._emotion_codes["Unknown"])
+            record["confidence"] = state.confidence
+
+            flags = FLAG_FACE_DETECTED if state.face_detected else 0
+            if state.calibrating:
+                flags |= FLAG_CALIBRATING
+            if state.warming_up:
+                flags |= FLAG_WARMING_UP
+            if state.drowsiness:
+                record["ear"] = state.drowsiness.ear
+                record["mar"] = state.drowsiness.mar
+                flags |= FLAG_DROWSY if state.drowsiness.is_drowsy else 0
+                flags |= FLAG_YAWNING if state.drowsiness.is_yawning else 0
+            else:
+                record["ear"] = np.nan
+                record["mar"] = np.nan
+            if state.attention:
+                record["pitch"] = state.attention.pitch
+                record["yaw"] = state.attention.yaw
+                flags |= FLAG_LOOKING if state.attention.is_looking_at_screen else 0
+            else:
+                record["pitch"] = np.nan
+                record["yaw"] = np.nan
+                flags |= FLAG_LOOKING
+            record["flags"] = flags
+            record["emotion_scores"] = [state.emotion_scores.get(label, 0.0) for label in EmotionClassifier.EMOTION_LABELS]
+
+            self._pending_size += 1
+            if self._pending_size == self._batch_size:
+                self._batches.put(self._pending)
+                self._pending = np.zeros(self._batch_size, dtype=RECORD_DTYPE)
+                self._pending_size = 0
+
+    def _take_pending(self) -> Optional[np.ndarray]:
+        with self._lock:
+            if self._pending_size == 0 or not self._batches.empty():
+                return None
+            batch = self._pending[:self._pending_size].copy()
+            self._pending_size = 0
+            return batch
+
+    def _writer_loop(self):
+        while True:
+            try:
+                batch = self._batches.get(timeout=self._flush_interval)
+            except queue.Empty:
+                batch = self._take_pending()
+                if batch is None:
+                    continue
+            if batch is None:
+                break
+            self._write(batch)
+
+    def _write(self, batch: np.ndarray):
+        try:
+            self._file.write(batch.tobytes())
+            self._file.flush()
+            self._written += len(batch)
+        except OSError as e:
+            logger.error(f"No se pudo escribir el diario de estados: {e}")
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._batches.put(None)
+        self._thread.join()
+        self._thread = None
+        batch = self._take_pending()
+        if batch is not None:
+            self._write(batch)
+        self._file.close()
+        self._file = None
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+
+class StateJournalReader:
+    def __init__(self, path: str):
+        _check_header(path)
+        self._path = path
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count > 0:
+            self._records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        else:
+            self._records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self._records[key]
+
+    @property
+    def records(self) -> np.ndarray:
+        return self._records
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._records["timestamp"]
+
+    @property
+    def emotion_scores(self) -> np.ndarray:
+        return self._records["emotion_scores"]
+
+    def flag(self, mask: int) -> np.ndarray:
+        return (self._records["flags"] & mask) != 0
+
+    def final_state_labels(self) -> np.ndarray:
+        return np.array(StateTimeline.FINAL_STATES)[self._records["final_state"]]
+
+    def emotion_labels(self) -> np.ndarray:
+        return np.array(StateTimeline.EMOTIONS)[self._records["emotion"]]
+
+    def time_in_states(self) -> Dict[str, float]:
+        if len(self._records) < 2:
+            return {name: 0.0 for name in StateTimeline.FINAL_STATES}
+        durations = np.diff(self.timestamps)
+        seconds = np.bincount(
+            self._records["final_state"][:-1],
+            weights=durations,
+            minlength=len(StateTimeline.FINAL_STATES)
+        )
+        return dict(zip(StateTimeline.FINAL_STATES, seconds.tolist()))
\ No newline at end of file
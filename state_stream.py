@@ -0,0 +1,98 @@
+import sys
+import json
+import time
+import socket
+import logging
+from typing import Dict, Optional, Tuple
+from state_aggregator import CombinedState
+
+
+logger = logging.getLogger("STREAM")
+
+
+def state_to_dict(
+    state: CombinedState,
+    frame: int,
+    timestamp: float,
+    bbox: Optional[Tuple[int, int, int, int]] = None
+) -> Dict[str, object]:
+    record = {
+        "frame": frame,
+        "timestamp": round(timestamp, 3),
+        "final_state": state.final_state,
+        "face_detected": state.face_detected,
+        "cognitive_state": state.cognitive_state,
+        "emotion": state.emotion,
+        "confidence": round(float(state.confidence), 4),
+        "calibrating": state.calibrating,
+        "warming_up": state.warming_up,
+        "bbox": [int(v) for v in bbox] if bbox else None,
+        "emotion_scores": {k: round(float(v), 2) for k, v in state.emotion_scores.items()}
+    }
+    if state.drowsiness:
+        record["drowsiness"] = {
+            "ear": round(float(state.drowsiness.ear), 4),
+            "mar": round(float(state.drowsiness.mar), 4),
+            "is_drowsy": bool(state.drowsiness.is_drowsy),
+            "is_yawning": bool(state.drowsiness.is_yawning)
+        }
+    if state.attention:
+        record["attention"] = {
+            "pitch": round(float(state.attention.pitch), 2),
+            "yaw": round(float(state.attention.yaw), 2),
+            "is_looking_at_screen": bool(state.attention.is_looking_at_screen)
+        }
+    return record
+
+
+class StateStreamWriter:
+    def __init__(self, target: str = "-", transitions_only: bool = False):
+        self._target = target
+        self._transitions_only = transitions_only
+        self._stream = None
+        self._socket: Optional[socket.socket] = None
+        self._last_state: Optional[str] = None
+        self._written = 0
+
+    def open(self):
+        if self._target == "-":
+            self._stream = sys.stdout
+        elif self._target.startswith("tcp://"):
+            host, port = self._target[len("tcp://"):].rsplit(":", 1)
+            self._socket = socket.create_connection((host, int(port)))
+            self._stream = self._socket.makefile("w", encoding="utf-8", newline="\n")
+        else:
+            self._stream = open(self._target, "a", encoding="utf-8")
+
+    def write(
+        self,
+        state: CombinedState,
+        frame: int,
+        bbox: Optional[Tuple[int, int, int, int]] = None,
+        timestamp: Optional[float] = None
+    ) -> bool:
+        if self._transitions_only and state.final_state == self._last_state:
+            return False
+        self._last_state = state.final_state
+
+        record = state_to_dict(state, frame, time.time() if timestamp is None else timestamp, bbox)
+        try:
+            self._stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._stream.flush()
+        except OSError as e:
+            logger.error(f"No se pudo escribir el estado: {e}")
+            return False
+        self._written += 1
+        return True
+
+    def close(self):
+        if self._stream is not None and self._stream is not sys.stdout:
+            self._stream.close()
+        if self._socket is not None:
+            self._socket.close()
+        self._stream = None
+        self._socket = None
+
+    @property
+    def written(self) -> int:
+        return self._written
\ No newline at end of file
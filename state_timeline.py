@@ -0,0 +1,113 @@
+import numpy as np
+from typing import Dict, List
+from state_aggregator import StateAggregator, CombinedState
+from emotion_classifier import EmotionClassifier
+
+
+class StateTimeline:
+    FINAL_STATES = StateAggregator.FINAL_STATES
+    EMOTIONS = EmotionClassifier.EMOTION_LABELS + ["Unknown"]
+    COGNITIVE_STATES = ["desconocido", "frustrado", "distraido", "concentrado", "entendiendo"]
+
+    COLUMNS = {
+        "frame": np.int64,
+        "timestamp": np.float64,
+        "face_detected": np.bool_,
+        "calibrating": np.bool_,
+        "final_state": np.uint8,
+        "cognitive_state": np.uint8,
+        "emotion": np.uint8,
+        "confidence": np.float32,
+        "ear": np.float32,
+        "mar": np.float32,
+        "is_drowsy": np.bool_,
+        "is_yawning": np.bool_,
+        "pitch": np.float32,
+        "yaw": np.float32,
+        "is_looking_at_screen": np.bool_
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._columns = {name: np.zeros(self._capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        self._scores = np.zeros((self._capacity, len(EmotionClassifier.EMOTION_LABELS)), dtype=np.float32)
+        self._final_codes = {name: i for i, name in enumerate(self.FINAL_STATES)}
+        self._cognitive_codes = {name: i for i, name in enumerate(self.COGNITIVE_STATES)}
+        self._emotion_codes = {name: i for i, name in enumerate(self.EMOTIONS)}
+
+    def append(self, state: CombinedState, frame: int, timestamp: float):
+        if self._size == self._capacity:
+            self._grow()
+
+        i = self._size
+        columns = self._columns
+        columns["frame"][i] = frame
+        columns["timestamp"][i] = timestamp
+        columns["face_detected"][i] = state.face_detected
+        columns["calibrating"][i] = state.calibrating
+        columns["final_state"][i] = self._final_codes.get(state.final_state, self._final_codes["desconocido"])
+        columns["cognitive_state"][i] = self._cognitive_codes.get(state.cognitive_state, 0)
+        columns["emotion"][i] = self._emotion_codes.get(state.emotion, self._emotion_codes["Unknown"])
+        columns["confidence"][i] = state.confidence
+
+        if state.drowsiness:
+            columns["ear"][i] = state.drowsiness.ear
+            columns["mar"][i] = state.drowsiness.mar
+            columns["is_drowsy"][i] = state.drowsiness.is_drowsy
+            columns["is_yawning"][i] = state.drowsiness.is_yawning
+        else:
+            columns["ear"][i] = np.nan
+            columns["mar"][i] = np.nan
+            columns["is_drowsy"][i] = False
+            columns["is_yawning"][i] = False
+
+        if state.attention:
+            columns["pitch"][i] = state.attention.pitch
+            columns["yaw"][i] = state.attention.yaw
+            columns["is_looking_at_screen"][i] = state.attention.is_looking_at_screen
+        else:
+            columns["pitch"][i] = np.nan
+            columns["yaw"][i] = np.nan
+            columns["is_looking_at_screen"][i] = True
+
+        self._scores[i] = [state.emotion_scores.get(label, 0.0) for label in EmotionClassifier.EMOTION_LABELS]
+        self._size += 1
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(self._capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        scores = np.zeros((self._capacity, self._scores.shape[1]), dtype=self._scores.dtype)
+        scores[:self._size] = self._scores[:self._size]
+        self._scores = scores
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        columns = {name: column[:self._size] for name, column in self._columns.items()}
+        columns["emotion_scores"] = self._scores[:self._size]
+        return columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def concatenate(cls, parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        names = list(cls.COLUMNS) + ["emotion_scores"]
+        return {name: np.concatenate([part[name] for part in parts]) for name in names}
+
+    @classmethod
+    def save(cls, path: str, columns: Dict[str, np.ndarray]):
+        np.savez_compressed(
+            path,
+            final_state_labels=np.array(cls.FINAL_STATES),
+            cognitive_state_labels=np.array(cls.COGNITIVE_STATES),
+            emotion_labels=np.array(cls.EMOTIONS),
+            **columns
+        )
+
+    @staticmethod
+    def load(path: str) -> Dict[str, np.ndarray]:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
\ No newline at end of file
@@ -0,0 +1,170 @@
+import numpy as np
+from typing import Iterator
+
+
+class RunningMedian:
+    def __init__(self, window: int):
+        self._window = window
+        self._ring = np.zeros(window, dtype=np.float64)
+        self._sorted = np.zeros(window, dtype=np.float64)
+        self._count = 0
+        self._pos = 0
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self._count == self._window:
+            index = int(np.searchsorted(self._sorted, self._ring[self._pos]))
+            self._sorted[index:-1] = self._sorted[index + 1:]
+            size = self._count - 1
+        else:
+            size = self._count
+            self._count += 1
+
+        index = int(np.searchsorted(self._sorted[:size], value))
+        self._sorted[index + 1:size + 1] = self._sorted[index:size]
+        self._sorted[index] = value
+        self._ring[self._pos] = value
+        self._pos = (self._pos + 1) % self._window
+        return self.median
+
+    def reset(self):
+        self._count = 0
+        self._pos = 0
+
+    @property
+    def median(self) -> float:
+        if self._count == 0:
+            return 0.0
+        middle = self._count // 2
+        if self._count % 2:
+            return float(self._sorted[middle])
+        return float((self._sorted[middle - 1] + self._sorted[middle]) / 2)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+class RunningStats:
+    def __init__(self, window: int):
+        self._window = window
+        self._ring = np.zeros(window, dtype=np.float64)
+        self._count = 0
+        self._pos = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float):
+        value = float(value)
+        if self._count == self._window:
+            old = float(self._ring[self._pos])
+            self._count -= 1
+            if self._count == 0:
+                self._mean = 0.0
+                self._m2 = 0.0
+            else:
+                delta = old - self._mean
+                self._mean -= delta / self._count
+                self._m2 = max(0.0, self._m2 - delta * (old - self._mean))
+
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+        self._ring[self._pos] = value
+        self._pos = (self._pos + 1) % self._window
+
+    def reset(self):
+        self._count = 0
+        self._pos = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self._count if self._count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+class ExponentialMovingAverage:
+    def __init__(self, size: int, alpha: float):
+        self._alpha = alpha
+        self._value = np.zeros(size, dtype=np.float64)
+        self._scratch = np.zeros(size, dtype=np.float64)
+        self._initialized = False
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        if not self._initialized:
+            self._value[:] = values
+            self._initialized = True
+        else:
+            np.multiply(values, self._alpha, out=self._scratch)
+            self._value *= 1.0 - self._alpha
+            self._value += self._scratch
+        return self._value
+
+    def reset(self):
+        self._initialized = False
+
+    @property
+    def value(self) -> np.ndarray:
+        return self._value
+
+
+class ModeCounter:
+    def __init__(self, num_classes: int, window: int):
+        self._window = window
+        self._counts = np.zeros(num_classes, dtype=np.int64)
+        self._ring = np.zeros(window, dtype=np.int64)
+        self._count = 0
+        self._pos = 0
+
+    def update(self, label: int) -> int:
+        if self._count == self._window:
+            self._counts[self._ring[self._pos]] -= 1
+        else:
+            self._count += 1
+        self._counts[label] += 1
+        self._ring[self._pos] = label
+        self._pos = (self._pos + 1) % self._window
+        return self.mode
+
+    def labels(self) -> Iterator[int]:
+        start = self._pos if self._count == self._window else 0
+        for i in range(self._count):
+            yield int(self._ring[(start + i) % self._window])
+
+    def reset(self):
+        self._counts[:] = 0
+        self._count = 0
+        self._pos = 0
+
+    @property
+    def mode(self) -> int:
+        best = int(np.argmax(self._counts))
+        top = self._counts[best]
+        if np.count_nonzero(self._counts == top) == 1:
+            return best
+        for label in self.labels():
+            if self._counts[label] == top:
+                return label
+        return best
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts
+
+    @property
+    def count(self) -> int:
+        return self._count
\ No newline at end of file
@@ -0,0 +1,297 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from typing import Dict, List, Optional
+from config import AppConfig
+from drowsiness_analyzer import hysteresis_counter
+from state_timeline import StateTimeline
+
+
+LABEL_KINDS = ("drowsy", "yawning", "not_looking")
+
+
+def parse_grid(spec: str, integer: bool = False) -> np.ndarray:
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        values = np.arange(start, stop + step / 2, step)
+    else:
+        values = np.array([float(part) for part in spec.split(",")])
+    return np.unique(np.round(values).astype(np.int64)) if integer else values
+
+
+def load_session(path: str) -> Dict[str, np.ndarray]:
+    if path.endswith(".stj"):
+        from state_journal import StateJournalReader, FLAG_FACE_DETECTED, FLAG_CALIBRATING
+        journal = StateJournalReader(path)
+        records = journal.records
+        return {
+            "timestamp": np.asarray(records["timestamp"]),
+            "face_detected": journal.flag(FLAG_FACE_DETECTED),
+            "calibrating": journal.flag(FLAG_CALIBRATING),
+            "ear": np.asarray(records["ear"]),
+            "mar": np.asarray(records["mar"]),
+            "pitch": np.asarray(records["pitch"]),
+            "yaw": np.asarray(records["yaw"])
+        }
+
+    data = StateTimeline.load(path)
+    if "landmark_indices" in data:
+        from landmark_trace import TraceReplay
+        data = TraceReplay(data).to_timeline()
+    return {name: data[name] for name in ("timestamp", "face_detected", "calibrating", "ear", "mar", "pitch", "yaw")}
+
+
+def load_labels(path: str) -> List[Dict[str, object]]:
+    with open(path) as f:
+        intervals = json.load(f)
+    for interval in intervals:
+        if interval["label"] not in LABEL_KINDS:
+            raise ValueError(f"Etiqueta desconocida: {interval['label']}")
+    return intervals
+
+
+def label_mask(intervals: List[Dict[str, object]], kind: str, timestamps: np.ndarray, source: Optional[str] = None) -> np.ndarray:
+    mask = np.zeros(len(timestamps), dtype=bool)
+    for interval in intervals:
+        if interval["label"] != kind or (source is not None and interval.get("session", source) != source):
+            continue
+        start, end = np.searchsorted(timestamps, [interval["start"], interval["end"]], side="left")
+        mask[start:end] = True
+    return mask
+
+
+class CounterSweep:
+    def __init__(self, frame_thresholds: np.ndarray, decay: int = 1, max_cells: int = 20_000_000):
+        self._frame_thresholds = np.maximum(1, np.asarray(frame_thresholds, dtype=np.int64))
+        self._decay = decay
+        self._max_cells = max_cells
+        self._buckets = int(self._frame_thresholds.max()) + 2
+        self._rows = 0
+        self._events: Optional[np.ndarray] = None
+        self._active: Optional[np.ndarray] = None
+        self._true_positive: Optional[np.ndarray] = None
+        self._labeled = 0
+        self._frames = 0
+
+    def add(self, conditions: np.ndarray, labels: Optional[np.ndarray] = None):
+        rows, frames = conditions.shape
+        if self._events is None:
+            self._rows = rows
+            self._events = np.zeros((rows, self._buckets), dtype=np.int64)
+            self._active = np.zeros((rows, self._buckets), dtype=np.int64)
+            self._true_positive = np.zeros((rows, self._buckets), dtype=np.int64)
+        self._frames += frames
+        if labels is not None:
+            self._labeled += int(np.count_nonzero(labels))
+        if frames == 0:
+            return
+
+        chunk = max(1, self._max_cells // frames)
+        for start in range(0, rows, chunk):
+            block = conditions[start:start + chunk]
+            counters = np.minimum(hysteresis_counter(block, decay=self._decay), self._buckets - 1)
+            offsets = np.arange(len(block))[:, None] * self._buckets
+            flat = counters + offsets
+            size = len(block) * self._buckets
+            shape = (len(block), self._buckets)
+
+            self._events[start:start + chunk] += np.bincount(flat[block], minlength=size).reshape(shape)
+            self._active[start:start + chunk] += np.bincount(flat.ravel(), minlength=size).reshape(shape)
+            if labels is not None:
+                self._true_positive[start:start + chunk] += np.bincount(
+                    flat[:, labels].ravel(), minlength=size
+                ).reshape(shape)
+
+    def results(self) -> Dict[str, np.ndarray]:
+        thresholds = self._frame_thresholds
+        active = np.cumsum(self._active[:, ::-1], axis=1)[:, ::-1][:, thresholds]
+        events = self._events[:, thresholds]
+        true_positive = np.cumsum(self._true_positive[:, ::-1], axis=1)[:, ::-1][:, thresholds]
+
+        precision = np.divide(true_positive, active, out=np.zeros(active.shape), where=active > 0)
+        recall = np.divide(true_positive, self._labeled, out=np.zeros(active.shape), where=self._labeled > 0)
+        f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(active.shape), where=(precision + recall) > 0)
+        true_negative = self._frames - active - self._labeled + true_positive
+        agreement = (true_positive + true_negative) / max(1, self._frames)
+        return {
+            "events": events.ravel(),
+            "active_frames": active.ravel(),
+            "precision": precision.ravel(),
+            "recall": recall.ravel(),
+            "f1": f1.ravel(),
+            "agreement": agreement.ravel()
+        }
+
+    @property
+    def labeled_frames(self) -> int:
+        return self._labeled
+
+
+class ThresholdSweep:
+    def __init__(
+        self,
+        ear_thresholds: np.ndarray,
+        mar_thresholds: np.ndarray,
+        drowsy_frames: np.ndarray,
+        yawn_frames: np.ndarray,
+        pitch_thresholds: np.ndarray,
+        yaw_thresholds: np.ndarray,
+        not_looking_frames: np.ndarray
+    ):
+        self._ear = np.asarray(ear_thresholds, dtype=np.float64)
+        self._mar = np.asarray(mar_thresholds, dtype=np.float64)
+        self._pitch = np.asarray(pitch_thresholds, dtype=np.float64)
+        self._yaw = np.asarray(yaw_thresholds, dtype=np.float64)
+        self._drowsy_frames = np.asarray(drowsy_frames)
+        self._yawn_frames = np.asarray(yawn_frames)
+        self._not_looking_frames = np.asarray(not_looking_frames)
+        self._drowsy = CounterSweep(drowsy_frames)
+        self._yawning = CounterSweep(yawn_frames)
+        self._not_looking = CounterSweep(not_looking_frames, decay=2)
+
+    def add_session(self, session: Dict[str, np.ndarray], intervals: Optional[List[Dict[str, object]]] = None, source: Optional[str] = None):
+        timestamps = session["timestamp"]
+        labels = {}
+        if intervals is not None:
+            labels = {kind: label_mask(intervals, kind, timestamps, source) for kind in LABEL_KINDS}
+
+        ear = session["ear"].astype(np.float64)
+        mar = session["mar"].astype(np.float64)
+        analyzed = session["face_detected"] & ~np.isnan(ear)
+        self._drowsy.add(ear[analyzed][None, :] < self._ear[:, None], labels["drowsy"][analyzed] if labels else None)
+        self._yawning.add(mar[analyzed][None, :] > self._mar[:, None], labels["yawning"][analyzed] if labels else None)
+
+        pitch = session["pitch"].astype(np.float64)
+        yaw = session["yaw"].astype(np.float64)
+        attended = session["face_detected"] & ~session["calibrating"] & ~np.isnan(pitch)
+        pitch = np.abs(pitch[attended])
+        yaw = np.abs(yaw[attended])
+        conditions = (
+            (pitch[None, None, :] > self._pitch[:, None, None]) |
+            (yaw[None, None, :] > self._yaw[None, :, None])
+        ).reshape(-1, len(pitch))
+        self._not_looking.add(conditions, labels["not_looking"][attended] if labels else None)
+
+    def results(self) -> Dict[str, Dict[str, np.ndarray]]:
+        drowsy_ear, drowsy_frames = np.meshgrid(self._ear, self._drowsy_frames, indexing="ij")
+        yawn_mar, yawn_frames = np.meshgrid(self._mar, self._yawn_frames, indexing="ij")
+        pitch, yaw, not_looking_frames = np.meshgrid(self._pitch, self._yaw, self._not_looking_frames, indexing="ij")
+        return {
+            "drowsy": {
+                "ear_threshold": drowsy_ear.ravel(),
+                "drowsy_frames_threshold": drowsy_frames.ravel(),
+                **self._drowsy.results()
+            },
+            "yawning": {
+                "mar_threshold": yawn_mar.ravel(),
+                "yawn_frames_threshold": yawn_frames.ravel(),
+                **self._yawning.results()
+            },
+            "not_looking": {
+                "pitch_threshold": pitch.ravel(),
+                "yaw_threshold": yaw.ravel(),
+                "not_looking_frames_threshold": not_looking_frames.ravel(),
+                **self._not_looking.results()
+            }
+        }
+
+    @property
+    def configurations(self) -> int:
+        return (
+            len(self._ear) * len(self._drowsy_frames) +
+            len(self._mar) * len(self._yawn_frames) +
+            len(self._pitch) * len(self._yaw) * len(self._not_looking_frames)
+        )
+
+    @property
+    def labeled_frames(self) -> Dict[str, int]:
+        return {
+            "drowsy": self._drowsy.labeled_frames,
+            "yawning": self._yawning.labeled_frames,
+            "not_looking": self._not_looking.labeled_frames
+        }
+
+
+def save_csv(path: str, results: Dict[str, Dict[str, np.ndarray]]):
+    with open(path, "w") as f:
+        for kind, columns in results.items():
+            names = list(columns)
+            f.write("kind," + ",".join(names) + "\n")
+            for row in zip(*(columns[name] for name in names)):
+                f.write(kind + "," + ",".join(f"{value:g}" for value in row) + "\n")
+
+
+def main():
+    defaults = AppConfig()
+    parser = argparse.ArgumentParser(description="Barrido vectorizado de umbrales sobre sesiones grabadas")
+    parser.add_argument("sessions", nargs="+", help="Lineas de tiempo (.npz), trazas de landmarks (.npz) o diarios (.stj)")
+    parser.add_argument("--labels", default=None, help="JSON con intervalos [{label, start, end, session?}] en segundos")
+    parser.add_argument("--ear", default="0.15:0.30:0.01", help="Umbrales EAR (inicio:fin:paso o lista)")
+    parser.add_argument("--mar", default="0.4:0.8:0.05", help="Umbrales MAR")
+    parser.add_argument("--drowsy-frames", default="5:40:5", help="Frames para confirmar somnolencia")
+    parser.add_argument("--yawn-frames", default="5:30:5", help="Frames para confirmar bostezo")
+    parser.add_argument("--pitch", default="10:60:5", help="Umbrales de pitch (grados)")
+    parser.add_argument("--yaw", default="10:60:5", help="Umbrales de yaw (grados)")
+    parser.add_argument("--not-looking-frames", default="5:40:5", help="Frames para confirmar que no mira")
+    parser.add_argument("-o", "--output", default="sweep_results.csv", help="CSV con los resultados por configuracion")
+    parser.add_argument("--top", type=int, default=5, help="Mejores configuraciones a mostrar por tipo")
+    args = parser.parse_args()
+
+    sweep = ThresholdSweep(
+        ear_thresholds=parse_grid(args.ear),
+        mar_thresholds=parse_grid(args.mar),
+        drowsy_frames=parse_grid(args.drowsy_frames, integer=True),
+        yawn_frames=parse_grid(args.yawn_frames, integer=True),
+        pitch_thresholds=parse_grid(args.pitch),
+        yaw_thresholds=parse_grid(args.yaw),
+        not_looking_frames=parse_grid(args.not_looking_frames, integer=True)
+    )
+    intervals = load_labels(args.labels) if args.labels else None
+
+    started = time.perf_counter()
+    frames = 0
+    for path in args.sessions:
+        session = load_session(path)
+        frames += len(session["timestamp"])
+        sweep.add_session(session, intervals, path)
+    results = sweep.results()
+    elapsed = time.perf_counter() - started
+
+    print(f"[INFO] {sweep.configurations} configuraciones x {frames} frames en {elapsed:.2f}s")
+    save_csv(args.output, results)
+    print(f"[INFO] Resultados guardados en {args.output}")
+
+    current = {
+        "drowsy": (defaults.drowsiness.ear_threshold, defaults.drowsiness.drowsy_frames_threshold),
+        "yawning": (defaults.drowsiness.mar_threshold, defaults.drowsiness.yawn_frames_threshold),
+        "not_looking": (
+            defaults.attention.pitch_threshold,
+            defaults.attention.yaw_threshold,
+            defaults.attention.not_looking_frames_threshold
+        )
+    }
+    labeled = sweep.labeled_frames
+    for kind, columns in results.items():
+        parameters = [name for name in columns if name.endswith("_threshold")]
+        if labeled[kind]:
+            order = np.argsort(-columns["f1"], kind="stable")[:args.top]
+            print(f"[{kind.upper()}] actual: {current[kind]} | mejores por f1")
+        else:
+            distance = sum(np.abs(columns[name] - value) / (np.ptp(columns[name]) or 1.0) for name, value in zip(parameters, current[kind]))
+            order = np.argsort(distance, kind="stable")[:args.top]
+            print(f"[{kind.upper()}] actual: {current[kind]} | configuraciones mas cercanas")
+        for i in order:
+            values = " ".join(f"{name}={columns[name][i]:g}" for name in parameters)
+            print(
+                f"  {values} | eventos: {columns['events'][i]} | frames: {columns['active_frames'][i]} | "
+                f"precision: {columns['precision'][i]:.2f} | recall: {columns['recall'][i]:.2f} | f1: {columns['f1'][i]:.2f}"
+            )
+
+    if not intervals:
+        print("[INFO] Sin etiquetas: solo se reportan conteos de eventos", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
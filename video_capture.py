@@ -1,13 +1,40 @@
+import os
 import cv2
+import time
+import logging
+import threading
 import numpy as np
-from typing import Optional, Tuple
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+from config import CaptureConfig
+
+
+logger = logging.getLogger("VIDEO_CAPTURE")
+
+
+@dataclass
+class CapturedFrame:
+    frame: np.ndarray
+    timestamp: float
+    sequence: int
 
 
 class VideoCapture:
-    def __init__(self, source: int = 0):
-        self._source = source
+    def __init__(self, source: Union[int, str] = None, config: CaptureConfig = None):
+        self._config = config or CaptureConfig()
+        self._source = self._config.source if source is None else source
         self._cap = None
         self._frame_size = (640, 480)
+        self._buffer = deque(maxlen=max(1, self._config.buffer_size))
+        self._condition = threading.Condition()
+        self._grabber = None
+        self._grabbing = False
+        self._grabber_exited = False
+        self._release_on_exit = False
+        self._sequence = 0
+        self._last_read_sequence = 0
+        self._dropped_frames = 0
 
     def open(self) -> bool:
         self._cap = cv2.VideoCapture(self._source)
@@ -16,18 +43,85 @@ class VideoCapture:
                 int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
                 int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             )
+            if self._config.threaded:
+                self._start_grabber()
             return True
         return False
 
-    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+    def _start_grabber(self):
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._grabbing = True
+        self._grabber_exited = False
+        self._release_on_exit = False
+        self._grabber = threading.Thread(target=self._grab_loop, name="VideoCaptureGrabber", daemon=True)
+        self._grabber.start()
+
+    def _grab_loop(self):
+        cap = self._cap
+        while self._grabbing:
+            ret, frame = cap.read()
+            timestamp = time.monotonic()
+            with self._condition:
+                if not ret:
+                    self._grabbing = False
+                    self._condition.notify_all()
+                    break
+                self._sequence += 1
+                self._buffer.append(CapturedFrame(frame=frame, timestamp=timestamp, sequence=self._sequence))
+                self._condition.notify_all()
+        with self._condition:
+            self._grabber_exited = True
+            if self._release_on_exit:
+                cap.release()
+
+    def read_frame(self, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
         if self._cap is None:
+            return None
+
+        if not self._config.threaded:
+            ret, frame = self._cap.read()
+            if not ret:
+                return None
+            self._sequence += 1
+            self._last_read_sequence = self._sequence
+            return CapturedFrame(frame=frame, timestamp=time.monotonic(), sequence=self._sequence)
+
+        with self._condition:
+            has_new_frame = self._condition.wait_for(
+                lambda: not self._grabbing or (self._buffer and self._buffer[-1].sequence > self._last_read_sequence),
+                timeout=self._config.read_timeout if timeout is None else timeout
+            )
+            if not has_new_frame or not self._buffer or self._buffer[-1].sequence <= self._last_read_sequence:
+                return None
+            latest = self._buffer[-1]
+            self._dropped_frames += latest.sequence - self._last_read_sequence - 1
+            self._last_read_sequence = latest.sequence
+            return latest
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        captured = self.read_frame()
+        if captured is None:
             return False, None
-        return self._cap.read()
+        return True, captured.frame
 
     def release(self):
+        self._grabbing = False
+        release_capture = True
+        if self._grabber is not None:
+            self._grabber.join(timeout=self._config.read_timeout)
+            with self._condition:
+                if not self._grabber_exited:
+                    self._release_on_exit = True
+                    release_capture = False
+            if not release_capture:
+                logger.warning("El hilo de captura sigue bloqueado leyendo; liberara la camara al terminar")
+            self._grabber = None
         if self._cap:
-            self._cap.release()
+            if release_capture:
+                self._cap.release()
             self._cap = None
+        with self._condition:
+            self._buffer.clear()
 
     @property
     def frame_size(self) -> Tuple[int, int]:
@@ -35,4 +129,88 @@ class VideoCapture:
 
     @property
     def is_opened(self) -> bool:
-        return self._cap is not None and self._cap.isOpened()
\ No newline at end of file
+        if self._config.threaded and not self._grabbing:
+            return False
+        return self._cap is not None and self._cap.isOpened()
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames
+
+    @property
+    def last_sequence(self) -> int:
+        return self._last_read_sequence
+
+
+class ImageDirectoryCapture:
+    IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._files = []
+        self._position = 0
+        self._frame_size = (640, 480)
+        self._opened = False
+
+    def open(self) -> bool:
+        if not os.path.isdir(self._directory):
+            return False
+        self._files = sorted(
+            os.path.join(self._directory, name) for name in os.listdir(self._directory)
+            if name.lower().endswith(self.IMAGE_EXTENSIONS)
+        )
+        if not self._files:
+            return False
+        first = cv2.imread(self._files[0])
+        if first is None:
+            return False
+        self._frame_size = (first.shape[1], first.shape[0])
+        self._position = 0
+        self._opened = True
+        return True
+
+    def read_frame(self, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        while self._opened and self._position < len(self._files):
+            frame = cv2.imread(self._files[self._position])
+            self._position += 1
+            if frame is not None:
+                return CapturedFrame(frame=frame, timestamp=time.monotonic(), sequence=self._position)
+        return None
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        captured = self.read_frame()
+        if captured is None:
+            return False, None
+        return True, captured.frame
+
+    def release(self):
+        self._opened = False
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        return self._frame_size
+
+    @property
+    def is_opened(self) -> bool:
+        return self._opened
+
+    @property
+    def dropped_frames(self) -> int:
+        return 0
+
+    @property
+    def last_sequence(self) -> int:
+        return self._position
+
+
+def parse_source(source: str) -> Union[int, str]:
+    return int(source) if source.isdigit() else source
+
+
+def create_capture(source: Union[int, str], config: CaptureConfig = None) -> Union[VideoCapture, ImageDirectoryCapture]:
+    if isinstance(source, str) and os.path.isdir(source):
+        return ImageDirectoryCapture(source)
+    if config is not None and config.shared_memory:
+        from shared_frame_ring import SharedMemoryCapture
+        return SharedMemoryCapture(source, config)
+    return VideoCapture(source, config)
\ No newline at end of file